@@ -0,0 +1,316 @@
+"""
+Benchmark dos algoritmos de busca em grafos sintéticos.
+
+Gera grafos reprodutíveis (por semente) de três famílias, de 1e3 a 1e7
+arestas, e mede cada algoritmo com perf_counter_ns, aquecimento e
+repetições. Para cada (gerador, tamanho, algoritmo) reporta latência
+mediana e p95, nós expandidos por segundo e pico de memória (tracemalloc),
+gravando JSON e CSV que podem ser comparados entre versões.
+
+Uso:
+    python benchmark.py executar [--geradores grade geometrico livre_escala]
+                                 [--tamanhos 1e3 1e4 1e5] [--algoritmos bfs a_estrela ...]
+                                 [--consultas 10] [--repeticoes 5] [--aquecimento 2]
+                                 [--landmarks 0] [--semente 0] [--saida resultado/benchmark.json]
+                                 [--grafico]
+    python benchmark.py comparar resultado/antes.json resultado/depois.json
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from functools import partial
+
+import numpy as np
+
+from codigo import (GrafoCompacto, montar_csr, bfs, dfs, busca_gulosa, a_estrela, busca_bidirecional,
+                    a_estrela_bidirecional, aprofundamento_iterativo, ida_estrela, TAMANHO_TRANSPOSICAO)
+
+ALGORITMOS = {
+    'bfs': bfs,
+    'dfs': dfs,
+    'busca_gulosa': busca_gulosa,
+    'a_estrela': a_estrela,
+    'busca_bidirecional': busca_bidirecional,
+    'a_estrela_bidirecional': a_estrela_bidirecional,
+    'aprofundamento_iterativo': partial(aprofundamento_iterativo, tamanho_transposicao=TAMANHO_TRANSPOSICAO),
+    'ida_estrela': partial(ida_estrela, tamanho_transposicao=TAMANHO_TRANSPOSICAO),
+}
+
+# IDDFS e IDA* refazem a busca a cada novo limite (o IDA*, uma vez por valor
+# distinto de f) e ficam fora do padrão
+ALGORITMOS_PADRAO = ['bfs', 'dfs', 'busca_gulosa', 'a_estrela', 'busca_bidirecional', 'a_estrela_bidirecional']
+
+# Geradores de Grafos
+def grafo_de_arestas(origens, destinos, pesos, num_vertices):
+    """
+    Monta um GrafoCompacto com rótulos com zeros à esquerda, para que a
+    ordem lexicográfica dos rótulos coincida com a numérica
+    """
+    largura = len(str(max(num_vertices - 1, 0)))
+    rotulos = np.char.zfill(np.arange(num_vertices).astype(str), largura)
+    return GrafoCompacto(rotulos, *montar_csr(origens, destinos, pesos, num_vertices))
+
+def nos_dois_sentidos(origens, destinos, pesos):
+    return (np.concatenate([origens, destinos]), np.concatenate([destinos, origens]),
+            np.concatenate([pesos, pesos]))
+
+def gerar_grade(arestas_alvo, rng):
+    """
+    Grade quadrada com vizinhança 4 (≈ 4 arestas por vértice), pesos de 1 a 20
+    """
+    lado = max(2, math.ceil(math.sqrt(arestas_alvo / 4)))
+    ids = np.arange(lado * lado).reshape(lado, lado)
+    origens = np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()])
+    destinos = np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()])
+    pesos = rng.integers(1, 21, len(origens)).astype(np.float64)
+    return grafo_de_arestas(*nos_dois_sentidos(origens, destinos, pesos), lado * lado)
+
+def gerar_geometrico(arestas_alvo, rng, grau=8):
+    """
+    Grafo geométrico aleatório: pontos no quadrado unitário ligados quando a
+    distância é menor que r, com r escolhido para dar ~`grau` vizinhos.
+    Pares candidatos vêm de uma grade de células de lado r; peso = distância
+    em décimos de r (inteiro >= 1).
+    """
+    n = max(2, arestas_alvo // grau)
+    raio = math.sqrt(grau / (math.pi * n))
+    pontos = rng.random((n, 2))
+    celulas_lado = max(1, int(1 / raio))
+    celula = np.minimum((pontos * celulas_lado).astype(np.int64), celulas_lado - 1)
+    chave = celula[:, 0] * celulas_lado + celula[:, 1]
+    ordem = np.argsort(chave, kind='stable')
+    chave_ordenada = chave[ordem]
+    inicio_celula = np.searchsorted(chave_ordenada, np.arange(celulas_lado * celulas_lado))
+    fim_celula = np.searchsorted(chave_ordenada, np.arange(celulas_lado * celulas_lado), side='right')
+
+    origens, destinos = [], []
+    for dx, dy in ((0, 0), (0, 1), (1, -1), (1, 0), (1, 1)):
+        vizinha_x, vizinha_y = celula[:, 0] + dx, celula[:, 1] + dy
+        valida = (vizinha_x < celulas_lado) & (vizinha_y >= 0) & (vizinha_y < celulas_lado)
+        pontos_validos = np.flatnonzero(valida)
+        vizinha = vizinha_x[valida] * celulas_lado + vizinha_y[valida]
+        quantos = fim_celula[vizinha] - inicio_celula[vizinha]
+        # expansão vetorizada de intervalos: cada ponto contra todos da célula vizinha
+        i = np.repeat(pontos_validos, quantos)
+        deslocamento = np.arange(quantos.sum()) - np.repeat(np.cumsum(quantos) - quantos, quantos)
+        j = ordem[np.repeat(inicio_celula[vizinha], quantos) + deslocamento]
+        manter = i < j if (dx, dy) == (0, 0) else np.ones(len(i), dtype=bool)
+        origens.append(i[manter])
+        destinos.append(j[manter])
+
+    origens, destinos = np.concatenate(origens), np.concatenate(destinos)
+    distancias = np.linalg.norm(pontos[origens] - pontos[destinos], axis=1)
+    perto = distancias < raio
+    origens, destinos = origens[perto], destinos[perto]
+    pesos = np.maximum(1, np.round(distancias[perto] / raio * 10))
+    return grafo_de_arestas(*nos_dois_sentidos(origens, destinos, pesos), n)
+
+def gerar_livre_de_escala(arestas_alvo, rng, m=4):
+    """
+    Barabási-Albert: cada vértice novo liga-se a `m` vértices escolhidos com
+    probabilidade proporcional ao grau. Os vértices entram em lotes (cada lote
+    com metade do tamanho atual) sorteando entre as pontas das arestas já
+    existentes, aproximação que permite gerar 1e7 arestas sem laço por vértice.
+    """
+    n = max(m + 2, arestas_alvo // (2 * m))
+    nucleo = np.arange(m + 1)
+    origens = [np.repeat(nucleo, m)]
+    destinos = [np.array([j for i in nucleo for j in nucleo if j != i])]
+    pontas = np.concatenate([origens[0], destinos[0]])
+
+    atual = m + 1
+    while atual < n:
+        lote = min(n - atual, max(1, atual // 2))
+        novos = np.repeat(np.arange(atual, atual + lote), m)
+        alvos = pontas[rng.integers(0, len(pontas), len(novos))]
+        origens.append(novos)
+        destinos.append(alvos)
+        pontas = np.concatenate([pontas, novos, alvos])
+        atual += lote
+
+    origens, destinos = np.concatenate(origens), np.concatenate(destinos)
+    pesos = rng.integers(1, 21, len(origens)).astype(np.float64)
+    return grafo_de_arestas(*nos_dois_sentidos(origens, destinos, pesos), n)
+
+GERADORES = {
+    'grade': gerar_grade,
+    'geometrico': gerar_geometrico,
+    'livre_escala': gerar_livre_de_escala,
+}
+
+# Medição
+def medir_algoritmo(algoritmo, grafo, pares, repeticoes, aquecimento):
+    """
+    Roda `aquecimento` consultas descartadas e depois `repeticoes` vezes cada
+    par; um par extra sob tracemalloc mede o pico de memória sem contaminar
+    os tempos
+    """
+    codificados = [(grafo.codificar(inicio), grafo.codificar(fim)) for inicio, fim in pares]
+    for inicio, fim in codificados[:aquecimento]:
+        algoritmo(grafo, inicio, fim)
+
+    amostras = []
+    nos_expandidos = 0
+    for inicio, fim in codificados:
+        for _ in range(repeticoes):
+            antes = time.perf_counter_ns()
+            _, _, expandidos = algoritmo(grafo, inicio, fim)
+            amostras.append(time.perf_counter_ns() - antes)
+            nos_expandidos += expandidos
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    algoritmo(grafo, *codificados[0])
+    memoria_pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    tempo_total = sum(amostras) / 1e9
+    return {
+        'amostras': len(amostras),
+        'mediana_ms': statistics.median(amostras) / 1e6,
+        'p95_ms': float(np.percentile(amostras, 95)) / 1e6,
+        'nos_expandidos_medio': nos_expandidos / len(amostras),
+        'nos_por_segundo': nos_expandidos / tempo_total if tempo_total else 0.0,
+        'memoria_pico_kb': memoria_pico / 1024,
+    }
+
+def metadados(args):
+    try:
+        versao = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        versao = ''
+    return {
+        'versao': versao or 'desconhecida',
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'parametros': vars(args),
+    }
+
+def executar_benchmark(args):
+    resultados = []
+    for nome_gerador in args.geradores:
+        for tamanho in args.tamanhos:
+            rng = np.random.default_rng(args.semente)
+            inicio_geracao = time.perf_counter()
+            grafo = GERADORES[nome_gerador](int(tamanho), rng)
+            tempo_geracao = time.perf_counter() - inicio_geracao
+            if args.landmarks:
+                grafo.preparar_landmarks(args.landmarks, args.semente)
+
+            n = len(grafo.vertices)
+            pares = [(grafo.rotulos[i], grafo.rotulos[j])
+                     for i, j in rng.integers(0, n, (args.consultas, 2)).tolist()]
+            print(f"\n🧪 {nome_gerador} ~{int(tamanho):,} arestas: {n:,} vértices, "
+                  f"{grafo.num_arestas:,} arestas (gerado em {tempo_geracao:.2f}s)")
+
+            for nome in args.algoritmos:
+                medida = medir_algoritmo(ALGORITMOS[nome], grafo, pares, args.repeticoes, args.aquecimento)
+                print(f"  {nome:24} mediana {medida['mediana_ms']:10.3f} ms | p95 {medida['p95_ms']:10.3f} ms | "
+                      f"{medida['nos_por_segundo']:12,.0f} nós/s | {medida['memoria_pico_kb']:10,.1f} KiB")
+                resultados.append({
+                    'gerador': nome_gerador,
+                    'tamanho_alvo': int(tamanho),
+                    'vertices': n,
+                    'arestas': grafo.num_arestas,
+                    'algoritmo': nome,
+                    **medida,
+                })
+    return resultados
+
+def salvar(resultados, args):
+    os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as arquivo:
+        json.dump({'metadados': metadados(args), 'resultados': resultados}, arquivo, indent=2, ensure_ascii=False)
+
+    arquivo_csv = os.path.splitext(args.saida)[0] + '.csv'
+    with open(arquivo_csv, 'w', newline='', encoding='utf-8') as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=list(resultados[0]))
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+    print(f"\n📁 Resultados em {args.saida} e {arquivo_csv}")
+
+def gerar_curvas(resultados, saida):
+    """
+    Curvas de escala: latência mediana x número de arestas, por gerador
+    """
+    import matplotlib.pyplot as plt
+
+    geradores = sorted({r['gerador'] for r in resultados})
+    fig, eixos = plt.subplots(1, len(geradores), figsize=(6 * len(geradores), 5), squeeze=False)
+    for eixo, gerador in zip(eixos[0], geradores):
+        for algoritmo in sorted({r['algoritmo'] for r in resultados}):
+            pontos = sorted((r['arestas'], r['mediana_ms']) for r in resultados
+                            if r['gerador'] == gerador and r['algoritmo'] == algoritmo)
+            eixo.plot(*zip(*pontos), marker='o', label=algoritmo)
+        eixo.set_xscale('log')
+        eixo.set_yscale('log')
+        eixo.set_title(gerador)
+        eixo.set_xlabel("Arestas")
+        eixo.set_ylabel("Latência mediana (ms)")
+        eixo.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig(saida, dpi=150)
+    print(f"📈 Curvas de escala em {saida}")
+
+def comparar(antes, depois):
+    """
+    Compara dois arquivos de resultado: razão das medianas (depois / antes)
+    """
+    with open(antes, encoding='utf-8') as arquivo:
+        dados_antes = json.load(arquivo)
+    with open(depois, encoding='utf-8') as arquivo:
+        dados_depois = json.load(arquivo)
+
+    chave = lambda r: (r['gerador'], r['tamanho_alvo'], r['algoritmo'])
+    referencia = {chave(r): r for r in dados_antes['resultados']}
+    print(f"Comparando {dados_antes['metadados']['versao']} -> {dados_depois['metadados']['versao']}")
+    print(f"{'gerador':12} {'arestas':>10} {'algoritmo':24} {'antes ms':>10} {'depois ms':>10} {'razão':>7}")
+    for r in dados_depois['resultados']:
+        anterior = referencia.get(chave(r))
+        if anterior is None:
+            continue
+        razao = r['mediana_ms'] / anterior['mediana_ms'] if anterior['mediana_ms'] else float('inf')
+        alerta = " ⚠️" if razao > 1.1 else ""
+        print(f"{r['gerador']:12} {r['tamanho_alvo']:>10,} {r['algoritmo']:24} "
+              f"{anterior['mediana_ms']:10.3f} {r['mediana_ms']:10.3f} {razao:7.2f}{alerta}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de busca")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    executar = comandos.add_parser('executar', help="gera os grafos e mede os algoritmos")
+    executar.add_argument('--geradores', nargs='+', choices=list(GERADORES), default=list(GERADORES))
+    executar.add_argument('--tamanhos', nargs='+', type=float, default=[1e3, 1e4, 1e5],
+                          help="número aproximado de arestas de cada grafo (até 1e7)")
+    executar.add_argument('--algoritmos', nargs='+', choices=list(ALGORITMOS), default=ALGORITMOS_PADRAO)
+    executar.add_argument('--consultas', type=int, default=10)
+    executar.add_argument('--repeticoes', type=int, default=5)
+    executar.add_argument('--aquecimento', type=int, default=2)
+    executar.add_argument('--landmarks', type=int, default=0)
+    executar.add_argument('--semente', type=int, default=0)
+    executar.add_argument('--saida', default='resultado/benchmark.json')
+    executar.add_argument('--grafico', action='store_true', help="salva as curvas de escala em PNG")
+
+    comparacao = comandos.add_parser('comparar', help="compara dois arquivos de resultado")
+    comparacao.add_argument('antes')
+    comparacao.add_argument('depois')
+
+    args = parser.parse_args()
+    if args.comando == 'comparar':
+        comparar(args.antes, args.depois)
+    else:
+        resultados = executar_benchmark(args)
+        salvar(resultados, args)
+        if args.grafico:
+            gerar_curvas(resultados, os.path.splitext(args.saida)[0] + '.png')
@@ -1,56 +1,248 @@
+import hashlib
 import heapq
+import math
 import time
 import os
-from collections import deque
-import pandas as pd
-import matplotlib.pyplot as plt
+import tempfile
+import tracemalloc
+import zipfile
+from collections import deque, OrderedDict
+from functools import partial
+from itertools import count
+import numpy as np
+
+PASTA_CACHE = '.cache_grafos'
+
+# Colunas de nós lidas como texto pelos dois carregadores: o rótulo é o texto
+# da célula ('01' continua '01') e não muda com o tipo que o pandas inferiria
+# (uma célula vazia faria a coluna virar float e '2' virar '2.0')
+TIPOS_ROTULOS = {'No_Origem': str, 'No_Destino': str}
+
+def ler_tabela_arestas(arquivo):
+    """
+    Lê o arquivo (Excel, com fallback para CSV) e valida as colunas
+    """
+    # Verifica se o arquivo existe
+    if not os.path.exists(arquivo):
+        raise FileNotFoundError(f"Arquivo {arquivo} não encontrado")
+    
+    import pandas as pd
+    
+    # Tenta ler como Excel
+    try:
+        df = pd.read_excel(arquivo, engine='openpyxl', dtype=TIPOS_ROTULOS)
+    except:
+        # Se falhar, tenta como CSV
+        try:
+            df = pd.read_csv(arquivo, dtype=TIPOS_ROTULOS)
+        except Exception as e:
+            raise ValueError(f"Não foi possível ler como Excel ou CSV: {str(e)}")
+    
+    validar_colunas(df.columns)
+    return df
+
+def validar_colunas(colunas):
+    # Verifica colunas obrigatórias
+    colunas_necessarias = ['No_Origem', 'No_Destino', 'Peso']
+    if not all(col in colunas for col in colunas_necessarias):
+        raise ValueError(f"O arquivo deve conter as colunas: {', '.join(colunas_necessarias)}")
+
+def rotulos_da_coluna(coluna):
+    """
+    Equivalente vetorizado de str(valor).strip() para uma coluna inteira
+    """
+    return np.char.strip(coluna.to_numpy().astype(str))
+
+def montar_csr(origens, destinos, pesos, num_vertices):
+    """
+    Agrupa as arestas por origem (ordenação estável, preserva a ordem do
+    arquivo entre arestas da mesma origem) e devolve offsets/destinos/pesos
+    """
+    ordem = np.argsort(origens, kind='stable')
+    offsets = np.zeros(num_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(origens, minlength=num_vertices), out=offsets[1:])
+    return offsets, destinos[ordem].astype(np.int32), pesos[ordem].astype(np.float64)
+
+def csr_de_tabela(df):
+    """
+    Converte a tabela de arestas em (rotulos, offsets, destinos, pesos) sem
+    iterar linha a linha; rótulos internados em ordem lexicográfica
+    """
+    origens = rotulos_da_coluna(df['No_Origem'])
+    destinos = rotulos_da_coluna(df['No_Destino'])
+    pesos = df['Peso'].to_numpy(dtype=np.float64)
+    
+    rotulos, codigos = np.unique(np.concatenate([origens, destinos]), return_inverse=True)
+    codigos = codigos.reshape(-1)
+    offsets, destinos, pesos = montar_csr(codigos[:len(origens)], codigos[len(origens):], pesos, len(rotulos))
+    return rotulos, offsets, destinos, pesos
+
+def codificar_bloco(rotulos_bloco, indices):
+    """
+    Interna os rótulos de um bloco no dicionário global (ordem de aparição);
+    o laço em Python passa só pelos rótulos distintos do bloco
+    """
+    unicos, inversos = np.unique(rotulos_bloco, return_inverse=True)
+    ids = np.fromiter((indices.setdefault(r, len(indices)) for r in unicos.tolist()),
+                      dtype=np.int64, count=len(unicos))
+    return ids[inversos.reshape(-1)]
+
+def csr_em_blocos(arquivo, tamanho_bloco=1_000_000):
+    """
+    Lê uma lista de arestas CSV em blocos, em duas passadas, sem nunca ter
+    o arquivo inteiro em memória:
+      1. interna os rótulos e conta o grau de saída de cada vértice;
+      2. com os offsets calculados, preenche destinos/pesos pré-alocados,
+         cada bloco escrevendo direto na posição final de suas arestas.
+    O pico de memória fica perto do tamanho final do CSR. Os rótulos são lidos
+    como texto em todos os blocos (TIPOS_ROTULOS, como em ler_tabela_arestas),
+    para que um mesmo nó não mude de rótulo conforme o tipo inferido em cada
+    bloco.
+    """
+    import pandas as pd
+    
+    colunas = ['No_Origem', 'No_Destino', 'Peso']
+    validar_colunas(pd.read_csv(arquivo, nrows=0).columns)
+    
+    def blocos():
+        return pd.read_csv(arquivo, usecols=colunas, chunksize=tamanho_bloco, dtype=TIPOS_ROTULOS)
+    
+    # 1ª passada: rótulos e graus
+    indices = {}
+    graus = np.zeros(0, dtype=np.int64)
+    num_arestas = 0
+    for bloco in blocos():
+        origens = codificar_bloco(rotulos_da_coluna(bloco['No_Origem']), indices)
+        codificar_bloco(rotulos_da_coluna(bloco['No_Destino']), indices)
+        bloco['Peso'].to_numpy(dtype=np.float64)  # valida os pesos já na 1ª passada
+        
+        contagem = np.bincount(origens, minlength=len(indices))
+        graus = np.concatenate([graus, np.zeros(len(indices) - len(graus), dtype=np.int64)])
+        graus += contagem
+        num_arestas += len(bloco)
+    
+    # Reordena os rótulos lexicograficamente (mesma convenção de csr_de_tabela);
+    # a 2ª passada codifica por busca binária e o dicionário pode ser liberado
+    rotulos = np.array(list(indices), dtype=str)
+    del indices
+    ordem = np.argsort(rotulos, kind='stable')
+    rotulos = rotulos[ordem]
+    graus = graus[ordem]
+    
+    offsets = np.zeros(len(rotulos) + 1, dtype=np.int64)
+    np.cumsum(graus, out=offsets[1:])
+    destinos = np.empty(num_arestas, dtype=np.int32)
+    pesos = np.empty(num_arestas, dtype=np.float64)
+    cursor = offsets[:-1].copy()
+    
+    # 2ª passada: cada aresta vai para offsets[origem] + arestas já escritas da origem
+    for bloco in blocos():
+        origens = np.searchsorted(rotulos, rotulos_da_coluna(bloco['No_Origem']))
+        vizinhos = np.searchsorted(rotulos, rotulos_da_coluna(bloco['No_Destino']))
+        pesos_bloco = bloco['Peso'].to_numpy(dtype=np.float64)
+        
+        ordem = np.argsort(origens, kind='stable')
+        origens = origens[ordem]
+        inicio_grupos = np.flatnonzero(np.r_[True, origens[1:] != origens[:-1]])
+        tamanhos = np.diff(np.r_[inicio_grupos, len(origens)])
+        posicao_no_grupo = np.arange(len(origens)) - np.repeat(inicio_grupos, tamanhos)
+        
+        posicoes = cursor[origens] + posicao_no_grupo
+        destinos[posicoes] = vizinhos[ordem]
+        pesos[posicoes] = pesos_bloco[ordem]
+        cursor[origens[inicio_grupos]] += tamanhos
+    
+    return rotulos, offsets, destinos, pesos
+
+def caminho_cache(arquivo, modo='tabela'):
+    """
+    Prefixo dos arquivos .npy do cache, chaveado por caminho, tamanho, mtime
+    e carregador ('tabela' ou 'blocos'): cada carregador tem o próprio cache
+    """
+    info = os.stat(arquivo)
+    chave = f"{os.path.abspath(arquivo)}|{info.st_size}|{info.st_mtime_ns}|{modo}"
+    resumo = hashlib.sha1(chave.encode()).hexdigest()[:16]
+    pasta = os.path.join(os.path.dirname(os.path.abspath(arquivo)), PASTA_CACHE)
+    return os.path.join(pasta, f"{os.path.basename(arquivo)}-{resumo}")
+
+def carregar_csr(arquivo, usar_cache=True, tamanho_bloco=None):
+    """
+    Retorna (rotulos, offsets, destinos, pesos) do arquivo. Com cache, a
+    primeira leitura grava os arrays em .npy e as seguintes os mapeiam em
+    memória (mmap, sem cópia); mudar o arquivo muda a chave do cache.
+    Com `tamanho_bloco`, um CSV é lido em blocos por `csr_em_blocos`.
+    """
+    if not os.path.exists(arquivo):
+        raise FileNotFoundError(f"Arquivo {arquivo} não encontrado")
+    
+    partes = ('rotulos', 'offsets', 'destinos', 'pesos')
+    prefixo = caminho_cache(arquivo, 'blocos' if tamanho_bloco else 'tabela') if usar_cache else None
+    if prefixo and all(os.path.exists(f"{prefixo}.{parte}.npy") for parte in partes):
+        try:
+            return tuple(np.load(f"{prefixo}.{parte}.npy", mmap_mode='r') for parte in partes)
+        except (OSError, ValueError):
+            pass
+    
+    if tamanho_bloco:
+        arrays = csr_em_blocos(arquivo, tamanho_bloco)
+    else:
+        arrays = csr_de_tabela(ler_tabela_arestas(arquivo))
+    
+    if prefixo:
+        try:
+            os.makedirs(os.path.dirname(prefixo), exist_ok=True)
+            for parte, array in zip(partes, arrays):
+                # grava num temporário único por processo e renomeia: um cache
+                # parcial nunca é lido, mesmo com vários processos gravando juntos
+                descritor, temporario = tempfile.mkstemp(suffix='.npy', dir=os.path.dirname(prefixo))
+                try:
+                    with os.fdopen(descritor, 'wb') as saida:
+                        np.save(saida, array)
+                    os.replace(temporario, f"{prefixo}.{parte}.npy")
+                except BaseException:
+                    os.remove(temporario)
+                    raise
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o cache de {arquivo}: {str(e)}")
+    
+    return arrays
 
 class Grafo:
-    def __init__(self, arquivo):
+    def __init__(self, arquivo, usar_cache=True):
         """
         Inicializa o grafo a partir de um arquivo (Excel ou CSV)
         """
-        self.vertices, self.arestas = self.ler_grafo(arquivo)
+        self.vertices, self.arestas = self.ler_grafo(arquivo, usar_cache)
         self.heuristica = {}
+        self._iniciar_caches()
+
+    def _iniciar_caches(self):
+        self.landmarks = None
+        self._heuristica_padrao = None
+        self._destino_heuristica = None
+        self._arestas_reversas = None
+        self._peso_minimo = None
+        self.hierarquia = None
+        self.ouvintes = []
     
-    def ler_grafo(self, arquivo):
+    def ler_grafo(self, arquivo, usar_cache=True):
         """
         Lê o arquivo com tratamento robusto para diferentes formatos
         """
         try:
-            # Verifica se o arquivo existe
-            if not os.path.exists(arquivo):
-                raise FileNotFoundError(f"Arquivo {arquivo} não encontrado")
-            
-            # Tenta ler como Excel
-            try:
-                df = pd.read_excel(arquivo, engine='openpyxl')
-            except:
-                # Se falhar, tenta como CSV
-                try:
-                    df = pd.read_csv(arquivo)
-                except Exception as e:
-                    raise ValueError(f"Não foi possível ler como Excel ou CSV: {str(e)}")
+            rotulos, offsets, destinos, pesos = carregar_csr(arquivo, usar_cache)
             
-            # Verifica colunas obrigatórias
-            colunas_necessarias = ['No_Origem', 'No_Destino', 'Peso']
-            if not all(col in df.columns for col in colunas_necessarias):
-                raise ValueError(f"O arquivo deve conter as colunas: {', '.join(colunas_necessarias)}")
+            rotulos = rotulos.tolist()
+            offsets = offsets.tolist()
+            vizinhos = [rotulos[i] for i in destinos.tolist()]
+            pesos = pesos.tolist()
             
-            vertices = set()
+            vertices = set(rotulos)
             arestas = {}
-            
-            for _, row in df.iterrows():
-                origem = str(row['No_Origem']).strip()
-                destino = str(row['No_Destino']).strip()
-                peso = float(row['Peso'])
-                
-                vertices.add(origem)
-                vertices.add(destino)
-                
-                if origem not in arestas:
-                    arestas[origem] = []
-                arestas[origem].append((destino, peso))
+            for i, origem in enumerate(rotulos):
+                inicio, fim = offsets[i], offsets[i + 1]
+                if fim > inicio:
+                    arestas[origem] = list(zip(vizinhos[inicio:fim], pesos[inicio:fim]))
             
             return vertices, arestas
             
@@ -66,213 +258,1737 @@ class Grafo:
             return set(), {}
 
     def definir_heuristica(self, destino):
+        """
+        Usa os limites ALT quando há landmarks preparados; senão h = 1 para
+        todo vértice exceto o destino. A tabela constante é criada uma única
+        vez e a cada chamada só o destino anterior e o novo são trocados.
+        """
+        if self.landmarks is not None:
+            self.heuristica = self.landmarks.heuristica_para(destino)
+            return
+        
+        if self._heuristica_padrao is None:
+            self._heuristica_padrao = self._tabela_heuristica(1)
+        elif self._destino_heuristica is not None:
+            self._heuristica_padrao[self._destino_heuristica] = 1
+        
+        self._destino_heuristica = None
+        if destino in self.vertices:
+            self._heuristica_padrao[destino] = 0
+            self._destino_heuristica = destino
+        self.heuristica = self._heuristica_padrao
+
+    def _tabela_heuristica(self, valor):
+        return dict.fromkeys(self.vertices, valor)
+
+    def preparar_hierarquia(self, arquivo_cache=None):
+        """
+        Constrói (ou carrega de `arquivo_cache`, se existir) a hierarquia de
+        contração usada por `busca_ch`. Retorna o tempo de pré-processamento.
+        """
+        inicio_tempo = time.perf_counter()
+        hierarquia = None
+        if arquivo_cache and os.path.exists(arquivo_cache):
+            try:
+                hierarquia = HierarquiaContracao.carregar(arquivo_cache)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                pass  # arquivo truncado, corrompido ou de versão antiga: reconstrói
+            # só reusa a hierarquia salva para os mesmos vértices, arestas e pesos
+            if hierarquia is not None and (list(hierarquia.rotulos) != sorted(self.rotulos)
+                                           or int(hierarquia.arestas_grafo) != self.num_arestas
+                                           or str(hierarquia.resumo_pesos_grafo) != self.resumo_pesos()):
+                hierarquia = None
+        
+        if hierarquia is None:
+            hierarquia = HierarquiaContracao.construir(self)
+            if arquivo_cache:
+                try:
+                    hierarquia.salvar(arquivo_cache)
+                except OSError as e:
+                    print(f"⚠️ Não foi possível gravar a hierarquia: {str(e)}")
+        
+        self.hierarquia = hierarquia
+        return time.perf_counter() - inicio_tempo
+
+    def preparar_landmarks(self, k=8, semente=0):
+        """
+        Pré-processa K landmarks para a heurística ALT de `a_estrela`
+        """
+        self.landmarks = Landmarks(self, k, semente)
+        return self.landmarks
+
+    def vizinhos(self, no):
+        """
+        Retorna os pares (vizinho, peso) que saem de um vértice
+        """
+        return self.arestas.get(no, ())
+
+    def vizinhos_reversos(self, no):
+        """
+        Retorna os pares (origem, peso) que chegam a um vértice; a adjacência
+        reversa é montada a partir de `arestas` só no primeiro uso
+        """
+        if self._arestas_reversas is None:
+            reversas = {}
+            for origem, lista in self.arestas.items():
+                for destino, peso in lista:
+                    reversas.setdefault(destino, []).append((origem, peso))
+            self._arestas_reversas = reversas
+        return self._arestas_reversas.get(no, ())
+
+    @property
+    def rotulos(self):
+        return self.vertices
+
+    @property
+    def num_arestas(self):
+        return sum(len(lista) for lista in self.arestas.values())
+
+    def resumo_pesos(self):
+        """
+        sha1 dos pesos em ordem crescente (não depende da ordem das arestas)
+        """
+        pesos = np.fromiter((peso for lista in self.arestas.values() for _, peso in lista), dtype=np.float64)
+        return hashlib.sha1(np.sort(pesos).tobytes()).hexdigest()
+
+    def peso_minimo(self):
+        """
+        Menor peso de aresta (inf sem arestas), calculado uma vez
+        """
+        if self._peso_minimo is None:
+            self._peso_minimo = min((peso for lista in self.arestas.values() for _, peso in lista),
+                                    default=float('inf'))
+        return self._peso_minimo
+
+    def codificar(self, rotulo):
+        """
+        Converte um rótulo do arquivo no identificador usado pelas buscas
+        """
+        return rotulo
+
+    def decodificar(self, caminho):
+        """
+        Converte um caminho das buscas de volta para os rótulos do arquivo
+        """
+        return caminho
+
+    def compactar(self):
+        """
+        Gera a versão compacta (CSR) deste grafo
+        """
+        return GrafoCompacto.de_grafo(self)
+
+    def atualizar_aresta(self, origem, destino, peso):
+        """
+        Define o peso da aresta origem -> destino, criando-a (e os vértices)
+        se não existir. Arestas paralelas entre o mesmo par viram uma só.
+        """
+        lista = self.arestas.setdefault(origem, [])
+        posicoes = [i for i, (vizinho, _) in enumerate(lista) if vizinho == destino]
+        if posicoes:
+            lista[posicoes[0]] = (destino, peso)
+            for i in reversed(posicoes[1:]):
+                del lista[i]
+        else:
+            lista.append((destino, peso))
+        
+        if origem not in self.vertices or destino not in self.vertices:
+            self.vertices.update((origem, destino))
+            self._heuristica_padrao = None
+        
+        if self._arestas_reversas is not None:
+            reversas = self._arestas_reversas.setdefault(destino, [])
+            reversas[:] = [(vizinho, p) for vizinho, p in reversas if vizinho != origem]
+            reversas.append((origem, peso))
+        self._aresta_alterada(origem, destino)
+
+    def remover_aresta(self, origem, destino):
+        """
+        Remove a aresta origem -> destino; retorna False se ela não existia
+        """
+        lista = self.arestas.get(origem, [])
+        restantes = [(vizinho, peso) for vizinho, peso in lista if vizinho != destino]
+        if len(restantes) == len(lista):
+            return False
+        
+        if restantes:
+            self.arestas[origem] = restantes
+        else:
+            del self.arestas[origem]
+        
+        if self._arestas_reversas is not None:
+            reversas = self._arestas_reversas.get(destino, [])
+            reversas[:] = [(vizinho, p) for vizinho, p in reversas if vizinho != origem]
+        self._aresta_alterada(origem, destino)
+        return True
+
+    def _aresta_alterada(self, origem, destino):
+        # Distâncias mudaram: os limites ALT e a hierarquia deixam de valer
+        self.landmarks = None
+        self.hierarquia = None
+        self._peso_minimo = None
+        for ouvinte in self.ouvintes:
+            ouvinte(origem, destino)
+
+class GrafoCompacto(Grafo):
+    """
+    Grafo em formato CSR: os rótulos são internados como inteiros densos
+    (0..n-1) e a adjacência fica em três arrays contíguos:
+      - offsets[v]:offsets[v+1] delimita as arestas que saem de v
+      - destinos: vértice de chegada de cada aresta
+      - pesos: peso de cada aresta
+    As buscas trabalham com os inteiros; `decodificar` devolve os rótulos.
+    """
+    def __init__(self, rotulos, offsets, destinos, pesos):
+        self._rotulos = np.asarray(rotulos, dtype=str)
+        self._indices = None
+        # rótulos ordenados (caso do cache e de de_grafo) dispensam o dicionário
+        # rótulo -> id: `codificar` usa busca binária no próprio array
+        self._ordenados = bool(np.all(self._rotulos[:-1] < self._rotulos[1:]))
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.destinos = np.asarray(destinos, dtype=np.int32)
+        self.pesos = np.asarray(pesos, dtype=np.float64)
+        self.vertices = range(len(self._rotulos))
+        self.heuristica = []
+        self._iniciar_caches()
+        # memoryviews iteram devolvendo int/float nativos, sem criar escalares numpy
+        self._mv_offsets = memoryview(self.offsets)
+        self._mv_destinos = memoryview(self.destinos)
+        self._mv_pesos = memoryview(self.pesos)
+
+    @classmethod
+    def de_arquivo(cls, arquivo, usar_cache=True, tamanho_bloco=None):
+        """
+        Carrega direto em CSR, sem passar pelo dicionário de listas;
+        `tamanho_bloco` ativa a leitura em blocos para CSVs maiores que a RAM
+        """
+        try:
+            return cls(*carregar_csr(arquivo, usar_cache, tamanho_bloco))
+        except Exception as e:
+            print(f"❌ Erro ao processar {arquivo}: {str(e)}")
+            return cls([], [0], [], [])
+
+    @classmethod
+    def de_grafo(cls, grafo):
+        # Rótulos em ordem lexicográfica: os inteiros desempatam o heap na mesma
+        # ordem que as strings desempatariam no Grafo original
+        rotulos = sorted(grafo.vertices)
+        indices = {rotulo: i for i, rotulo in enumerate(rotulos)}
+        
+        offsets = np.zeros(len(rotulos) + 1, dtype=np.int64)
+        destinos = []
+        pesos = []
+        for i, rotulo in enumerate(rotulos):
+            for destino, peso in grafo.arestas.get(rotulo, ()):
+                destinos.append(indices[destino])
+                pesos.append(peso)
+            offsets[i + 1] = len(destinos)
+        
+        return cls(rotulos, offsets, destinos, pesos)
+
+    def _tabela_heuristica(self, valor):
+        return [valor] * len(self.vertices)
+
+    def vizinhos(self, no):
+        inicio, fim = self._mv_offsets[no], self._mv_offsets[no + 1]
+        return zip(self._mv_destinos[inicio:fim], self._mv_pesos[inicio:fim])
+
+    def vizinhos_reversos(self, no):
+        if self._arestas_reversas is None:
+            n = len(self.vertices)
+            origens = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.offsets))
+            ordem = np.argsort(self.destinos, kind='stable')
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.destinos, minlength=n), out=offsets[1:])
+            self._arestas_reversas = (memoryview(offsets), memoryview(origens[ordem]),
+                                      memoryview(self.pesos[ordem]))
+        offsets, origens, pesos = self._arestas_reversas
+        inicio, fim = offsets[no], offsets[no + 1]
+        return zip(origens[inicio:fim], pesos[inicio:fim])
+
+    @property
+    def rotulos(self):
+        return self._rotulos
+
+    @property
+    def num_arestas(self):
+        return len(self.destinos)
+
+    def resumo_pesos(self):
+        return hashlib.sha1(np.sort(self.pesos).tobytes()).hexdigest()
+
+    def peso_minimo(self):
+        if self._peso_minimo is None:
+            self._peso_minimo = float(self.pesos.min()) if len(self.pesos) else float('inf')
+        return self._peso_minimo
+
+    @property
+    def indices(self):
+        if self._indices is None:
+            self._indices = {rotulo: i for i, rotulo in enumerate(self._rotulos.tolist())}
+        return self._indices
+
+    def codificar(self, rotulo):
+        if self._ordenados:
+            i = int(np.searchsorted(self._rotulos, rotulo))
+            if i < len(self._rotulos) and self._rotulos[i] == rotulo:
+                return i
+            raise KeyError(rotulo)
+        return self.indices[rotulo]
+
+    def decodificar(self, caminho):
+        return [str(self._rotulos[no]) for no in caminho]
+
+    def compactar(self):
+        return self
+
+    def atualizar_aresta(self, origem, destino, peso):
+        raise TypeError("GrafoCompacto é imutável; altere um Grafo e compacte de novo")
+
+    def remover_aresta(self, origem, destino):
+        raise TypeError("GrafoCompacto é imutável; altere um Grafo e compacte de novo")
+
+def arvore_caminhos_minimos(grafo, origem, alvos=None, reverso=False):
+    """
+    Dijkstra um-para-muitos a partir de `origem` (sobre a adjacência reversa
+    com reverso=True). Com `alvos`, para assim que todos forem fechados.
+    Retorna (distancias, predecessores, nos_expandidos, pico_fronteira).
+    """
+    vizinhos = grafo.vizinhos_reversos if reverso else grafo.vizinhos
+    distancias = {origem: 0}
+    predecessores = {origem: origem}
+    heap = [(0, origem)]
+    fechados = set()
+    pendentes = set(alvos) if alvos is not None else None
+    nos_expandidos = 0
+    pico_fronteira = 1
+    
+    while heap:
+        custo, no = heapq.heappop(heap)
+        if no in fechados:
+            continue
+        fechados.add(no)
+        nos_expandidos += 1
+        
+        if pendentes is not None:
+            pendentes.discard(no)
+            if not pendentes:
+                break
+        
+        for vizinho, peso in vizinhos(no):
+            novo_custo = custo + peso
+            if novo_custo < distancias.get(vizinho, float('inf')):
+                distancias[vizinho] = novo_custo
+                predecessores[vizinho] = no
+                heapq.heappush(heap, (novo_custo, vizinho))
+        
+        if len(heap) > pico_fronteira:
+            pico_fronteira = len(heap)
+    
+    return distancias, predecessores, nos_expandidos, pico_fronteira
+
+def dijkstra_distancias(grafo, origem, reverso=False):
+    """
+    Distâncias mínimas de `origem` a todos os vértices alcançáveis
+    (ou de todos até `origem`, com reverso=True)
+    """
+    return arvore_caminhos_minimos(grafo, origem, reverso=reverso)[0]
+
+class Landmarks:
+    """
+    Heurística ALT (A*, Landmarks e desigualdade triangular).
+    Para K landmarks L guarda d(L, v) e d(v, L) de todo vértice em arrays
+    K x n; para qualquer destino t, h(v) = max(d(L,t) - d(L,v), d(v,L) - d(t,L))
+    é um limite inferior consistente de d(v, t). As tabelas por destino
+    ficam num cache LRU e são reaproveitadas entre consultas.
+    """
+    def __init__(self, grafo, k=8, semente=0, tamanho_cache=128):
+        self.compacto = isinstance(grafo, GrafoCompacto)
+        self.vertices = list(grafo.vertices) if self.compacto else sorted(grafo.vertices)
+        self.indices = None if self.compacto else {v: i for i, v in enumerate(self.vertices)}
+        self.tamanho_cache = tamanho_cache
+        self._cache = OrderedDict()
+        
+        n = len(self.vertices)
+        k = min(k, n)
+        self.distancias_de = np.full((k, n), np.inf)    # d(L, v)
+        self.distancias_para = np.full((k, n), np.inf)  # d(v, L)
+        self.marcos = []
+        
+        if n == 0:
+            return
+        
+        # Seleção "mais distante": cada novo landmark maximiza a menor distância
+        # (ida + volta) aos landmarks já escolhidos
+        rng = np.random.default_rng(semente)
+        escolhido = int(rng.integers(n))
+        separacao = np.full(n, np.inf)
+        for i in range(k):
+            self.marcos.append(self.vertices[escolhido])
+            self._preencher(grafo, i, self.vertices[escolhido])
+            ida_volta = self.distancias_de[i] + self.distancias_para[i]
+            separacao = np.minimum(separacao, np.where(np.isfinite(ida_volta), ida_volta, 0))
+            separacao[escolhido] = -1
+            escolhido = int(np.argmax(separacao))
+            if separacao[escolhido] <= 0:
+                self.distancias_de = self.distancias_de[:i + 1]
+                self.distancias_para = self.distancias_para[:i + 1]
+                break
+
+    def _indice(self, v):
+        return v if self.compacto else self.indices[v]
+
+    def _preencher(self, grafo, linha, marco):
+        for destino, reverso in ((self.distancias_de, False), (self.distancias_para, True)):
+            distancias = dijkstra_distancias(grafo, marco, reverso)
+            indices = np.fromiter((self._indice(v) for v in distancias), dtype=np.int64, count=len(distancias))
+            destino[linha, indices] = np.fromiter(distancias.values(), dtype=np.float64, count=len(distancias))
+
+    def limites(self, destino, reversa=False):
+        """
+        Array com o limite inferior de d(v, destino) para todo vértice
+        (ou de d(destino, v), com reversa=True, usado pela busca reversa)
+        """
+        t = self._indice(destino)
+        with np.errstate(invalid='ignore'):
+            if reversa:
+                frente = self.distancias_de - self.distancias_de[:, t:t + 1]
+                tras = self.distancias_para[:, t:t + 1] - self.distancias_para
+            else:
+                frente = self.distancias_de[:, t:t + 1] - self.distancias_de
+                tras = self.distancias_para - self.distancias_para[:, t:t + 1]
+        # inf - inf (sem informação do landmark) vira nan e é descartado
+        limites = np.fmax(np.fmax.reduce(frente, axis=0, initial=0),
+                          np.fmax.reduce(tras, axis=0, initial=0))
+        limites[t] = 0
+        return limites
+
+    def heuristica_para(self, destino, reversa=False):
+        """
+        Tabela h(v) indexável pelo vértice, servida do cache quando possível
+        """
+        chave = (destino, reversa)
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            return self._cache[chave]
+        
+        limites = self.limites(destino, reversa)
+        if self.compacto:
+            tabela = memoryview(limites)
+        else:
+            tabela = dict(zip(self.vertices, limites.tolist()))
         
-        for vertice in self.vertices:
-            self.heuristica[vertice] = 1 if vertice != destino else 0
+        self._cache[chave] = tabela
+        if len(self._cache) > self.tamanho_cache:
+            self._cache.popitem(last=False)
+        return tabela
 
-def medir_desempenho(algoritmo, grafo, inicio, fim):
+def medir_desempenho(algoritmo, grafo, inicio, fim, **opcoes):
     """
-    Mede tempo de execução e retorna resultados
+    Mede tempo de execução e retorna resultados. Contadores que o algoritmo
+    não informa (inserções etc. fora de busca_generica) voltam como None.
     """
-    inicio_tempo = time.time()
-    caminho, custo, nos_expandidos = algoritmo(grafo, inicio, fim)
-    tempo_execucao = time.time() - inicio_tempo
+    estatisticas = {}
+    inicio_tempo = time.perf_counter()
+    caminho, custo, nos_expandidos = algoritmo(grafo, grafo.codificar(inicio), grafo.codificar(fim),
+                                               estatisticas=estatisticas, **opcoes)
+    tempo_execucao = time.perf_counter() - inicio_tempo
     
     return {
-        'caminho': caminho if caminho else [],
+        'caminho': grafo.decodificar(caminho) if caminho else [],
         'custo': custo if caminho else float('inf'),
         'tempo': tempo_execucao,
-        'nos_expandidos': nos_expandidos
+        'nos_expandidos': nos_expandidos,
+        'pico_fronteira': estatisticas.get('pico_fronteira', 0),
+        'insercoes': estatisticas.get('insercoes'),
+        'remocoes': estatisticas.get('remocoes'),
+        'duplicadas': estatisticas.get('duplicadas'),
+        'podadas': estatisticas.get('podadas'),
+        'memoria_pico_kb': estatisticas.get('memoria_pico_kb')
     }
 
-# Algoritmos de Busca Cega
-def bfs(grafo, inicio, fim):
-    fila = deque([(inicio, [inicio], 0)])
-    visitados = set()
-    nos_expandidos = 0
+class Rastreador:
+    """
+    Observador opcional de busca_generica. Sem rastreador a busca só mantém
+    contadores locais; com ele, cada entrada inserida ou retirada da
+    fronteira passa por ao_inserir/ao_remover (que subclasses podem
+    sobrescrever) e:
+      - intervalo: a cada `intervalo` remoções guarda (remoções, tamanho da fronteira)
+      - memoria: mede o pico de memória alocada durante a busca com
+        tracemalloc (que deixa a busca bem mais lenta; não compare tempos)
+    """
+    def __init__(self, intervalo=0, memoria=False):
+        self.intervalo = intervalo
+        self.memoria = memoria
+        self.amostras = []
+        self._remocoes = 0
+        self._parar_tracemalloc = False
+
+    def iniciar(self):
+        self.amostras = []
+        self._remocoes = 0
+        if self.memoria:
+            self._parar_tracemalloc = not tracemalloc.is_tracing()
+            if self._parar_tracemalloc:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+    def ao_inserir(self, entrada):
+        pass
+
+    def ao_remover(self, entrada, tamanho_fronteira):
+        self._remocoes += 1
+        if self.intervalo and self._remocoes % self.intervalo == 0:
+            self.amostras.append((self._remocoes, tamanho_fronteira))
+
+    def finalizar(self, estatisticas):
+        if self.memoria:
+            estatisticas['memoria_pico_kb'] = tracemalloc.get_traced_memory()[1] / 1024
+            if self._parar_tracemalloc:
+                tracemalloc.stop()
+        if self.intervalo:
+            estatisticas['amostras_fronteira'] = self.amostras
+
+# Núcleo comum das buscas
+class HeapIndexado:
+    """
+    Heap binário com índice de posições: cada vértice aparece no máximo uma vez
+    e uma nova entrada para um vértice já enfileirado substitui a antiga
+    (decrease-key em O(log n)) em vez de duplicá-lo.
+    As entradas são tuplas (chave, nó, ...) ordenadas por (chave, nó).
+    """
+    def __init__(self, entradas=()):
+        self._heap = []
+        self._posicao = {}
+        self.substituicoes = 0
+        for entrada in entradas:
+            self.inserir(entrada)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, no):
+        return no in self._posicao
+
+    def inserir(self, entrada):
+        no = entrada[1]
+        if no in self._posicao:
+            i = self._posicao[no]
+            antiga = self._heap[i]
+            self.substituicoes += 1
+            self._heap[i] = entrada
+            if entrada[:2] < antiga[:2]:
+                self._subir(i)
+            else:
+                self._descer(i)
+        else:
+            self._heap.append(entrada)
+            self._posicao[no] = len(self._heap) - 1
+            self._subir(len(self._heap) - 1)
+
+    def remover(self):
+        heap = self._heap
+        topo = heap[0]
+        ultimo = heap.pop()
+        del self._posicao[topo[1]]
+        if heap:
+            heap[0] = ultimo
+            self._posicao[ultimo[1]] = 0
+            self._descer(0)
+        return topo
+
+    def _subir(self, i):
+        heap, posicao = self._heap, self._posicao
+        entrada = heap[i]
+        while i > 0:
+            pai = (i - 1) // 2
+            if heap[pai][:2] <= entrada[:2]:
+                break
+            heap[i] = heap[pai]
+            posicao[heap[i][1]] = i
+            i = pai
+        heap[i] = entrada
+        posicao[entrada[1]] = i
+
+    def _descer(self, i):
+        heap, posicao = self._heap, self._posicao
+        n = len(heap)
+        entrada = heap[i]
+        while True:
+            filho = 2 * i + 1
+            if filho >= n:
+                break
+            if filho + 1 < n and heap[filho + 1][:2] < heap[filho][:2]:
+                filho += 1
+            if entrada[:2] <= heap[filho][:2]:
+                break
+            heap[i] = heap[filho]
+            posicao[heap[i][1]] = i
+            i = filho
+        heap[i] = entrada
+        posicao[entrada[1]] = i
+
+def reconstruir_caminho(predecessores, inicio, fim):
+    """
+    Percorre os predecessores do destino até a origem
+    """
+    caminho = [fim]
+    while caminho[-1] != inicio:
+        caminho.append(predecessores[caminho[-1]])
+    caminho.reverse()
+    return caminho
+
+def busca_generica(grafo, inicio, fim, fronteira, heuristica=None, usar_custo=False,
+                   limite=None, filtrar_visitados=False, inverter_vizinhos=False,
+                   fila_prioridade='heapq', estatisticas=None, rastreador=None):
+    """
+    Núcleo compartilhado por bfs, dfs, busca_gulosa e a_estrela.
+    Entradas da fronteira: (chave, nó, contador de inserção, pai, custo, profundidade).
+      - fronteira: 'fila' (FIFO), 'pilha' (LIFO) ou 'heap' (menor chave)
+      - fila_prioridade (heap): 'heapq', 'melhor_g' (poda inserções que não
+        melhoram o custo) ou 'indexado' (HeapIndexado com decrease-key)
+      - estatisticas/rastreador: contadores da fronteira e observador opcional
+    """
+    predecessores = {}
+    contador = count(1)
+    if fronteira == 'heap' and fila_prioridade == 'indexado':
+        abertos = HeapIndexado([(heuristica[inicio], inicio, 0, inicio, 0, 1)])
+        remover = abertos.remover
+        inserir = abertos.inserir
+    elif fronteira == 'heap':
+        abertos = [(heuristica[inicio], inicio, 0, inicio, 0, 1)]
+        remover = partial(heapq.heappop, abertos)
+        inserir = partial(heapq.heappush, abertos)
+    elif fronteira == 'fila':
+        abertos = deque([(0, inicio, 0, inicio, 0, 1)])
+        remover = abertos.popleft
+        inserir = abertos.append
+    else:
+        abertos = [(0, inicio, 0, inicio, 0, 1)]
+        remover = abertos.pop
+        inserir = abertos.append
     
-    while fila:
-        no, caminho, custo = fila.popleft()
-        nos_expandidos += 1
+    if rastreador is not None:
+        rastreador.iniciar()
+        inserir_na_fronteira, remover_da_fronteira = inserir, remover
         
-        if no == fim:
-            return caminho, custo, nos_expandidos
+        def inserir(entrada):
+            rastreador.ao_inserir(entrada)
+            inserir_na_fronteira(entrada)
         
-        if no not in visitados:
-            visitados.add(no)
-            for vizinho, peso in grafo.arestas.get(no, []):
-                if vizinho not in visitados:
-                    fila.append((vizinho, caminho + [vizinho], custo + peso))
+        def remover():
+            entrada = remover_da_fronteira()
+            rastreador.ao_remover(entrada, len(abertos))
+            return entrada
     
-    return None, float('inf'), nos_expandidos
-
-def dfs(grafo, inicio, fim, limite=100):
-    pilha = [(inicio, [inicio], 0)]
+    usa_heap = fronteira == 'heap'
+    # melhor custo conhecido de cada vértice, usado para podar inserções dominadas
+    melhor_g = {inicio: 0} if usa_heap and fila_prioridade != 'heapq' else None
     visitados = set()
     nos_expandidos = 0
+    duplicadas = podadas = 0
+    pico_fronteira = len(abertos)
+    resultado = None, float('inf')
     
-    while pilha:
-        no, caminho, custo = pilha.pop()
+    while abertos:
+        _, no, _, pai, custo, profundidade = remover()
         nos_expandidos += 1
         
         if no == fim:
-            return caminho, custo, nos_expandidos
+            predecessores[no] = pai
+            resultado = reconstruir_caminho(predecessores, inicio, fim), custo
+            break
         
-        if no not in visitados and len(caminho) < limite:
-            visitados.add(no)
-            for vizinho, peso in reversed(grafo.arestas.get(no, [])):
-                if vizinho not in visitados:
-                    pilha.append((vizinho, caminho + [vizinho], custo + peso))
+        if no in visitados:
+            duplicadas += 1
+            continue
+        if limite is not None and profundidade >= limite:
+            continue
+        
+        visitados.add(no)
+        predecessores[no] = pai
+        vizinhos = grafo.vizinhos(no)
+        if inverter_vizinhos:
+            vizinhos = reversed(list(vizinhos))
+        
+        for vizinho, peso in vizinhos:
+            if filtrar_visitados and vizinho in visitados:
+                podadas += 1
+                continue
+            novo_custo = custo + peso
+            if melhor_g is not None:
+                if vizinho in visitados or novo_custo >= melhor_g.get(vizinho, float('inf')):
+                    podadas += 1
+                    continue
+                melhor_g[vizinho] = novo_custo
+            if usa_heap:
+                chave = heuristica[vizinho] + (novo_custo if usar_custo else 0)
+            else:
+                chave = 0
+            inserir((chave, vizinho, next(contador), no, novo_custo, profundidade + 1))
+        
+        if len(abertos) > pico_fronteira:
+            pico_fronteira = len(abertos)
+    
+    if estatisticas is not None:
+        estatisticas['pico_fronteira'] = pico_fronteira
+        estatisticas['remocoes'] = nos_expandidos
+        # a entrada inicial não conta como inserção
+        estatisticas['insercoes'] = (nos_expandidos + len(abertos) - 1
+                                     + getattr(abertos, 'substituicoes', 0))
+        estatisticas['duplicadas'] = duplicadas
+        estatisticas['podadas'] = podadas
+    if rastreador is not None:
+        rastreador.finalizar(estatisticas if estatisticas is not None else {})
     
-    return None, float('inf'), nos_expandidos
+    caminho, custo = resultado
+    return caminho, custo, nos_expandidos
+
+# Algoritmos de Busca Cega
+def bfs(grafo, inicio, fim, estatisticas=None, rastreador=None):
+    return busca_generica(grafo, inicio, fim, 'fila', filtrar_visitados=True,
+                          estatisticas=estatisticas, rastreador=rastreador)
+
+def dfs(grafo, inicio, fim, limite=100, estatisticas=None, rastreador=None):
+    return busca_generica(grafo, inicio, fim, 'pilha', limite=limite,
+                          filtrar_visitados=True, inverter_vizinhos=True,
+                          estatisticas=estatisticas, rastreador=rastreador)
 
 # Algoritmos de Busca Heurística
-def busca_gulosa(grafo, inicio, fim):
+def busca_gulosa(grafo, inicio, fim, fila_prioridade='heapq', estatisticas=None, rastreador=None):
     grafo.definir_heuristica(fim)
-    heap = [(grafo.heuristica[inicio], inicio, [inicio], 0)]
-    visitados = set()
-    nos_expandidos = 0
+    return busca_generica(grafo, inicio, fim, 'heap', heuristica=grafo.heuristica,
+                          fila_prioridade=fila_prioridade, estatisticas=estatisticas,
+                          rastreador=rastreador)
+
+def a_estrela(grafo, inicio, fim, fila_prioridade='heapq', estatisticas=None, rastreador=None):
+    grafo.definir_heuristica(fim)
+    return busca_generica(grafo, inicio, fim, 'heap', heuristica=grafo.heuristica, usar_custo=True,
+                          fila_prioridade=fila_prioridade, estatisticas=estatisticas,
+                          rastreador=rastreador)
+
+# Busca com Memória Limitada
+def busca_limitada(grafo, inicio, fim, limite, avaliar, tamanho_transposicao=0, limite_nos=None):
+    """
+    DFS que só desce por nós com avaliar(profundidade, custo, nó) <= limite,
+    evitando ciclos pelo caminho atual. Guarda o caminho e um iterador de
+    vizinhos por nível, então a memória é O(profundidade) mais a tabela de
+    transposição: até `tamanho_transposicao` nós com o menor valor com que
+    já foram alcançados nesta iteração. Um nó que volta com valor igual ou
+    maior tem a subárvore já explorada e é podado; sem a tabela a busca é
+    exponencial em grafos com muitos caminhos entre os mesmos nós.
+    Para ao expandir `limite_nos` nós.
+    Retorna (caminho, custo, nos_expandidos, menor valor acima do limite,
+    maior profundidade atingida, tamanho da tabela); o menor valor acima do
+    limite é None quando a busca foi interrompida por `limite_nos`.
+    """
+    nos_expandidos = 1
+    if inicio == fim:
+        return [inicio], 0, nos_expandidos, float('inf'), 1, 0
     
-    while heap:
-        _, no, caminho, custo = heapq.heappop(heap)
-        nos_expandidos += 1
+    caminho = [inicio]
+    custos = [0]
+    no_caminho = {inicio}
+    iteradores = [iter(grafo.vizinhos(inicio))]
+    excedente = float('inf')
+    profundidade_maxima = 1
+    transposicao = {inicio: avaliar(0, 0, inicio)} if tamanho_transposicao else {}
+    
+    while iteradores:
+        proximo = next(iteradores[-1], None)
+        if proximo is None:
+            iteradores.pop()
+            no_caminho.discard(caminho.pop())
+            custos.pop()
+            continue
         
-        if no == fim:
-            return caminho, custo, nos_expandidos
+        vizinho, peso = proximo
+        if vizinho in no_caminho:
+            continue
+        custo = custos[-1] + peso
+        valor = avaliar(len(caminho), custo, vizinho)
+        if valor > limite:
+            excedente = min(excedente, valor)
+            continue
+        visto = transposicao.get(vizinho)
+        if visto is not None and visto <= valor:
+            continue
+        if visto is not None or len(transposicao) < tamanho_transposicao:
+            transposicao[vizinho] = valor
+        
+        if limite_nos is not None and nos_expandidos >= limite_nos:
+            return None, float('inf'), nos_expandidos, None, profundidade_maxima, len(transposicao)
+        nos_expandidos += 1
+        if vizinho == fim:
+            return caminho + [vizinho], custo, nos_expandidos, excedente, len(caminho) + 1, len(transposicao)
         
-        if no not in visitados:
-            visitados.add(no)
-            for vizinho, peso in grafo.arestas.get(no, []):
-                heapq.heappush(heap, (grafo.heuristica[vizinho], vizinho, caminho + [vizinho], custo + peso))
+        caminho.append(vizinho)
+        custos.append(custo)
+        no_caminho.add(vizinho)
+        iteradores.append(iter(grafo.vizinhos(vizinho)))
+        profundidade_maxima = max(profundidade_maxima, len(caminho))
+    
+    return None, float('inf'), nos_expandidos, excedente, profundidade_maxima, len(transposicao)
+
+def aprofundar(grafo, inicio, fim, limite, avaliar, estatisticas, tamanho_transposicao, limite_nos):
+    """
+    Repete `busca_limitada` subindo o limite para o menor valor que o excedeu,
+    até achar o destino, nenhum nó ficar de fora ou o total de nós expandidos
+    chegar a `limite_nos` (aí devolve "sem caminho" e marca
+    estatisticas['interrompida']).
+    """
+    iteracoes = []
+    nos_expandidos = 0
+    resultado = None, float('inf')
+    interrompida = False
     
-    return None, float('inf'), nos_expandidos
+    while limite < float('inf'):
+        restantes = None if limite_nos is None else limite_nos - nos_expandidos
+        caminho, custo, expandidos, excedente, profundidade, transposicao = busca_limitada(
+            grafo, inicio, fim, limite, avaliar, tamanho_transposicao, restantes)
+        nos_expandidos += expandidos
+        iteracoes.append({'limite': limite, 'nos_expandidos': expandidos, 'profundidade_maxima': profundidade,
+                          'transposicao': transposicao})
+        if caminho is not None:
+            resultado = caminho, custo
+            break
+        if excedente is None:
+            interrompida = True
+            break
+        limite = excedente
+    
+    if estatisticas is not None:
+        estatisticas['iteracoes'] = iteracoes
+        estatisticas['interrompida'] = interrompida
+        # limite inicial infinito (ex.: ALT prova que o destino é inalcançável): nenhuma iteração
+        estatisticas['pico_fronteira'] = max((it['profundidade_maxima'] for it in iteracoes), default=0)
+    
+    caminho, custo = resultado
+    return caminho, custo, nos_expandidos
+
+def aprofundamento_iterativo(grafo, inicio, fim, limite_maximo=None, estatisticas=None,
+                             tamanho_transposicao=0, limite_nos=None):
+    """
+    DFS com aprofundamento iterativo: limites de profundidade 0, 1, 2, ...
+    sem conjunto global de visitados, então não perde caminhos como `dfs`.
+    Acha o caminho com menos arestas (não necessariamente o de menor custo).
+    Memória O(profundidade); com `tamanho_transposicao` > 0, mais uma tabela
+    de transposição (ver busca_limitada) com a menor profundidade de até
+    tantos nós, que evita reexpandir caminhos repetidos.
+    """
+    if limite_maximo is None:
+        limite_maximo = len(grafo.vertices)
+    avaliar = lambda profundidade, custo, no: profundidade if profundidade <= limite_maximo else float('inf')
+    return aprofundar(grafo, inicio, fim, 0, avaliar, estatisticas, tamanho_transposicao, limite_nos)
 
-def a_estrela(grafo, inicio, fim):
+def ida_estrela(grafo, inicio, fim, estatisticas=None, tamanho_transposicao=0, limite_nos=None):
+    """
+    IDA*: aprofundamento iterativo sobre f = g + h, começando em h(inicio).
+    Ótimo com heurística admissível; memória O(profundidade), mais a tabela
+    de transposição (menor g de até `tamanho_transposicao` nós) se > 0.
+    """
     grafo.definir_heuristica(fim)
-    heap = [(0 + grafo.heuristica[inicio], inicio, [inicio], 0)]
-    visitados = set()
+    heuristica = grafo.heuristica
+    avaliar = lambda profundidade, custo, no: custo + heuristica[no]
+    return aprofundar(grafo, inicio, fim, heuristica[inicio], avaliar, estatisticas,
+                      tamanho_transposicao, limite_nos)
+
+# Busca Bidirecional
+def busca_bidirecional(grafo, inicio, fim, potencial=None, estatisticas=None):
+    """
+    Dijkstra bidirecional: uma busca a partir de `inicio` sobre as arestas e
+    outra a partir de `fim` sobre a adjacência reversa, expandindo sempre o
+    lado de menor fronteira. Com chaves g_f(v) + p(v) e g_r(v) - p(v), para
+    quando topo_f + topo_r >= melhor custo de encontro já visto.
+    `potencial` (p) transforma a busca em A* bidirecional; deve ser
+    consistente nos dois sentidos (ver a_estrela_bidirecional).
+    """
+    if inicio == fim:
+        return [inicio], 0, 1
+    
+    p = potencial if potencial is not None else (lambda v: 0)
+    vizinhos = (grafo.vizinhos, grafo.vizinhos_reversos)
+    sinal = (1, -1)
+    custos = ({inicio: 0}, {fim: 0})
+    predecessores = ({inicio: inicio}, {fim: fim})
+    heaps = ([(p(inicio), inicio)], [(-p(fim), fim)])
+    fechados = (set(), set())
+    
+    melhor_custo = float('inf')
+    encontro = None
     nos_expandidos = 0
+    pico_fronteira = 2
     
-    while heap:
-        f, no, caminho, custo = heapq.heappop(heap)
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= melhor_custo:
+            break
+        
+        lado = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        _, no = heapq.heappop(heaps[lado])
+        if no in fechados[lado]:
+            continue
+        fechados[lado].add(no)
         nos_expandidos += 1
         
-        if no == fim:
-            return caminho, custo, nos_expandidos
+        custos_lado, custos_outro = custos[lado], custos[1 - lado]
+        custo = custos_lado[no]
+        for vizinho, peso in vizinhos[lado](no):
+            novo_custo = custo + peso
+            if novo_custo < custos_lado.get(vizinho, float('inf')):
+                custos_lado[vizinho] = novo_custo
+                predecessores[lado][vizinho] = no
+                heapq.heappush(heaps[lado], (novo_custo + sinal[lado] * p(vizinho), vizinho))
+                if vizinho in custos_outro and novo_custo + custos_outro[vizinho] < melhor_custo:
+                    melhor_custo = novo_custo + custos_outro[vizinho]
+                    encontro = vizinho
         
-        if no not in visitados:
-            visitados.add(no)
-            for vizinho, peso in grafo.arestas.get(no, []):
-                novo_custo = custo + peso
-                heapq.heappush(heap, (novo_custo + grafo.heuristica[vizinho], vizinho, caminho + [vizinho], novo_custo))
+        if len(heaps[0]) + len(heaps[1]) > pico_fronteira:
+            pico_fronteira = len(heaps[0]) + len(heaps[1])
+    
+    if estatisticas is not None:
+        estatisticas['pico_fronteira'] = pico_fronteira
     
-    return None, float('inf'), nos_expandidos
+    if encontro is None:
+        return None, float('inf'), nos_expandidos
+    
+    caminho = reconstruir_caminho(predecessores[0], inicio, encontro)
+    volta = reconstruir_caminho(predecessores[1], fim, encontro)
+    caminho.extend(reversed(volta[:-1]))
+    return caminho, melhor_custo, nos_expandidos
 
-def executar_testes():
-    resultados = []
+def a_estrela_bidirecional(grafo, inicio, fim, estatisticas=None):
+    """
+    A* bidirecional com potencial médio p(v) = (h_fim(v) - h_inicio(v)) / 2,
+    consistente para as duas buscas. Usa os limites ALT quando o grafo tem
+    landmarks; senão um passo constante por aresta, o de `definir_heuristica`
+    (1) limitado ao menor peso, para continuar consistente com pesos < 1.
+    """
+    if grafo.landmarks is not None:
+        ate_fim = grafo.landmarks.heuristica_para(fim)
+        desde_inicio = grafo.landmarks.heuristica_para(inicio, reversa=True)
+        potencial = lambda v: (ate_fim[v] - desde_inicio[v]) / 2
+    else:
+        passo = max(min(grafo.peso_minimo(), 1), 0)
+        potencial = lambda v: passo * ((v != fim) - (v != inicio)) / 2
+    
+    return busca_bidirecional(grafo, inicio, fim, potencial, estatisticas)
+
+# Hierarquia de Contração
+class HierarquiaContracao:
+    """
+    Contraction Hierarchies. O pré-processamento contrai os vértices um a um
+    (ordem por diferença de arestas + vizinhos já contraídos, com atualização
+    preguiçosa) e insere atalhos u -> w sempre que o único caminho mínimo de u
+    a w passava pelo vértice contraído. A consulta é um Dijkstra bidirecional
+    que só sobe na hierarquia, e os atalhos são desfeitos no caminho final.
+    Vértices são ids internos = posição em `rotulos` (rótulos ordenados,
+    a mesma numeração do GrafoCompacto). Os arrays CSR podem ser salvos em .npz,
+    junto com o número de arestas e o resumo dos pesos do grafo de origem.
+    """
+    PARTES = ('rotulos', 'nivel', 'cima_offsets', 'cima_destinos', 'cima_pesos', 'cima_meios',
+              'baixo_offsets', 'baixo_origens', 'baixo_pesos', 'baixo_meios',
+              'arestas_grafo', 'resumo_pesos_grafo')
+
+    def __init__(self, **arrays):
+        for nome in self.PARTES:
+            setattr(self, nome, arrays[nome])
+        self.indices = {rotulo: i for i, rotulo in enumerate(self.rotulos.tolist())}
+        # cima[v]: arestas v -> w com w acima de v (busca para frente)
+        # baixo[v]: arestas u -> v com u acima de v (busca para trás, a partir do destino)
+        self._cima = tuple(memoryview(np.ascontiguousarray(a)) for a in
+                           (self.cima_offsets, self.cima_destinos, self.cima_pesos, self.cima_meios))
+        self._baixo = tuple(memoryview(np.ascontiguousarray(a)) for a in
+                            (self.baixo_offsets, self.baixo_origens, self.baixo_pesos, self.baixo_meios))
+        self._nivel = memoryview(np.ascontiguousarray(self.nivel))
+
+    @classmethod
+    def construir(cls, grafo, limite_testemunha=100, limite_saltos=5, limite_simulacao=300):
+        """
+        `limite_testemunha`: vértices fechados por busca de testemunha;
+        `limite_saltos`: arestas no caminho de uma testemunha. Limites menores
+        deixam o pré-processamento mais rápido e geram mais atalhos (a
+        consulta continua exata: uma testemunha não achada só vira atalho).
+        `limite_simulacao`: acima deste número de pares (entrada x saída) a
+        prioridade de um vértice usa o total de pares como estimativa em vez
+        de simular a contração; as buscas de testemunha só rodam se ele for
+        de fato contraído.
+        """
+        rotulos = sorted(grafo.rotulos)
+        indices = {rotulo: i for i, rotulo in enumerate(rotulos)}
+        compacto = isinstance(grafo, GrafoCompacto)
+        n = len(rotulos)
+        
+        saida = [{} for _ in range(n)]
+        entrada = [{} for _ in range(n)]
+        for u, rotulo in enumerate(rotulos):
+            for v, peso in grafo.vizinhos(grafo.codificar(rotulo)):
+                v = indices[grafo.decodificar([v])[0] if compacto else v]
+                if u != v and peso < saida[u].get(v, (float('inf'),))[0]:
+                    saida[u][v] = (peso, -1)
+                    entrada[v][u] = (peso, -1)
+        
+        def testemunha(origem, ignorado, limite, alvos):
+            distancias = {origem: 0}
+            heap = [(0, 0, origem)]
+            pendentes = set(alvos)
+            fechados = 0
+            while heap and pendentes and fechados < limite_testemunha:
+                custo, saltos, u = heapq.heappop(heap)
+                if custo > distancias[u]:
+                    continue
+                if custo > limite:
+                    break
+                pendentes.discard(u)
+                fechados += 1
+                if saltos == limite_saltos:
+                    continue
+                for w, (peso, _) in saida[u].items():
+                    novo = custo + peso
+                    # acima de `limite` o caminho não serve de testemunha para nenhum alvo
+                    if novo <= limite and w != ignorado and novo < distancias.get(w, float('inf')):
+                        distancias[w] = novo
+                        heapq.heappush(heap, (novo, saltos + 1, w))
+            return distancias
+        
+        def atalhos(v):
+            necessarios = []
+            for u, (peso_u, _) in entrada[v].items():
+                alvos = {w: peso_u + peso_w for w, (peso_w, _) in saida[v].items() if w != u}
+                if not alvos:
+                    continue
+                distancias = testemunha(u, v, max(alvos.values()), alvos)
+                for w, custo in alvos.items():
+                    if distancias.get(w, float('inf')) > custo:
+                        necessarios.append((u, w, custo))
+            return necessarios
+        
+        vizinhos_contraidos = [0] * n
+        def prioridade(v):
+            # devolve também os atalhos: se v for contraído agora, são exatamente eles
+            # (None quando a simulação foi pulada e o total de pares, um limite
+            # superior, serviu de estimativa)
+            pares = len(entrada[v]) * len(saida[v])
+            necessarios = atalhos(v) if pares <= limite_simulacao else None
+            num_atalhos = pares if necessarios is None else len(necessarios)
+            return num_atalhos - len(entrada[v]) - len(saida[v]) + vizinhos_contraidos[v], necessarios
+        
+        heap = [(prioridade(v)[0], v) for v in range(n)]
+        heapq.heapify(heap)
+        nivel = np.zeros(n, dtype=np.int64)
+        cima = [[] for _ in range(n)]
+        baixo = [[] for _ in range(n)]
+        proximo_nivel = 0
+        
+        while heap:
+            _, v = heapq.heappop(heap)
+            atual, necessarios = prioridade(v)
+            if heap and atual > heap[0][0]:
+                heapq.heappush(heap, (atual, v))
+                continue
+            if necessarios is None:
+                # a estimativa não subestima a prioridade: v é mesmo o próximo
+                necessarios = atalhos(v)
+            
+            for u, w, custo in necessarios:
+                if custo < saida[u].get(w, (float('inf'),))[0]:
+                    saida[u][w] = (custo, v)
+                    entrada[w][u] = (custo, v)
+            
+            nivel[v] = proximo_nivel
+            proximo_nivel += 1
+            cima[v] = [(w, peso, meio) for w, (peso, meio) in saida[v].items()]
+            baixo[v] = [(u, peso, meio) for u, (peso, meio) in entrada[v].items()]
+            for w in saida[v]:
+                del entrada[w][v]
+                vizinhos_contraidos[w] += 1
+            for u in entrada[v]:
+                del saida[u][v]
+                vizinhos_contraidos[u] += 1
+            saida[v] = entrada[v] = None
+        
+        arrays = {'rotulos': np.asarray(rotulos, dtype=str), 'nivel': nivel,
+                  'arestas_grafo': np.int64(grafo.num_arestas),
+                  'resumo_pesos_grafo': np.str_(grafo.resumo_pesos())}
+        for nome, listas in (('cima', cima), ('baixo', baixo)):
+            offsets = np.zeros(n + 1, dtype=np.int64)
+            np.cumsum([len(lista) for lista in listas], out=offsets[1:])
+            arestas = [aresta for lista in listas for aresta in lista]
+            arrays[f'{nome}_offsets'] = offsets
+            arrays[f"{nome}_{'destinos' if nome == 'cima' else 'origens'}"] = np.array([a[0] for a in arestas], dtype=np.int32)
+            arrays[f'{nome}_pesos'] = np.array([a[1] for a in arestas], dtype=np.float64)
+            arrays[f'{nome}_meios'] = np.array([a[2] for a in arestas], dtype=np.int32)
+        return cls(**arrays)
+
+    @classmethod
+    def carregar(cls, caminho):
+        with np.load(caminho) as dados:
+            return cls(**{nome: dados[nome] for nome in cls.PARTES})
+
+    def salvar(self, caminho):
+        # temporário único por gravação (processos do pool podem salvar o mesmo
+        # grafo ao mesmo tempo); np.savez acrescenta .npz a nomes sem essa extensão
+        descritor, temporario = tempfile.mkstemp(suffix='.npz', dir=os.path.dirname(os.path.abspath(caminho)))
+        os.close(descritor)
+        try:
+            np.savez(temporario, **{nome: getattr(self, nome) for nome in self.PARTES})
+            os.replace(temporario, caminho)
+        except BaseException:
+            os.remove(temporario)
+            raise
+
+    @property
+    def num_atalhos(self):
+        return int((self.cima_meios >= 0).sum() + (self.baixo_meios >= 0).sum())
+
+    def _aresta(self, u, w):
+        """
+        (peso, meio) da aresta u -> w da hierarquia
+        """
+        if self._nivel[u] < self._nivel[w]:
+            offsets, vizinhos, pesos, meios = self._cima
+            no, procurado = u, w
+        else:
+            offsets, vizinhos, pesos, meios = self._baixo
+            no, procurado = w, u
+        for i in range(offsets[no], offsets[no + 1]):
+            if vizinhos[i] == procurado:
+                return pesos[i], meios[i]
+        raise KeyError((u, w))
+
+    def _desempacotar(self, u, w, caminho):
+        pilha = [(u, w)]
+        while pilha:
+            a, b = pilha.pop()
+            _, meio = self._aresta(a, b)
+            if meio < 0:
+                caminho.append(b)
+            else:
+                pilha.append((meio, b))
+                pilha.append((a, meio))
+
+    def consultar(self, origem, destino):
+        """
+        Caminho mínimo entre ids internos: (caminho, custo, nos_expandidos, pico_fronteira)
+        """
+        if origem == destino:
+            return [origem], 0, 1, 1
+        
+        lados = (self._cima, self._baixo)
+        custos = ({origem: 0}, {destino: 0})
+        predecessores = ({origem: origem}, {destino: destino})
+        heaps = ([(0, origem)], [(0, destino)])
+        fechados = (set(), set())
+        melhor_custo = float('inf')
+        encontro = None
+        nos_expandidos = 0
+        pico_fronteira = 2
+        
+        # Cada lado só para quando seu menor custo já não pode melhorar o encontro
+        while heaps[0] or heaps[1]:
+            for lado in (0, 1):
+                heap = heaps[lado]
+                if heap and heap[0][0] >= melhor_custo:
+                    heap.clear()
+                if not heap:
+                    continue
+                custo, no = heapq.heappop(heap)
+                if no in fechados[lado]:
+                    continue
+                fechados[lado].add(no)
+                nos_expandidos += 1
+                
+                outro = custos[1 - lado]
+                if no in outro and custo + outro[no] < melhor_custo:
+                    melhor_custo = custo + outro[no]
+                    encontro = no
+                
+                offsets, vizinhos, pesos, _ = lados[lado]
+                custos_lado = custos[lado]
+                for i in range(offsets[no], offsets[no + 1]):
+                    vizinho, novo_custo = vizinhos[i], custo + pesos[i]
+                    if novo_custo < custos_lado.get(vizinho, float('inf')):
+                        custos_lado[vizinho] = novo_custo
+                        predecessores[lado][vizinho] = no
+                        heapq.heappush(heap, (novo_custo, vizinho))
+            
+            if len(heaps[0]) + len(heaps[1]) > pico_fronteira:
+                pico_fronteira = len(heaps[0]) + len(heaps[1])
+        
+        if encontro is None:
+            return None, float('inf'), nos_expandidos, pico_fronteira
+        
+        subida = reconstruir_caminho(predecessores[0], origem, encontro)
+        descida = reconstruir_caminho(predecessores[1], destino, encontro)[::-1]
+        caminho = [origem]
+        for trecho in (subida, descida):
+            for u, w in zip(trecho, trecho[1:]):
+                self._desempacotar(u, w, caminho)
+        return caminho, melhor_custo, nos_expandidos, pico_fronteira
+
+def busca_ch(grafo, inicio, fim, estatisticas=None):
+    """
+    Consulta a hierarquia preparada por `grafo.preparar_hierarquia()`
+    """
+    hierarquia = grafo.hierarquia
+    if hierarquia is None:
+        raise ValueError("Hierarquia não preparada: chame grafo.preparar_hierarquia() antes")
+    
+    # um GrafoCompacto com rótulos ordenados já usa a numeração da hierarquia
+    mesma_numeracao = isinstance(grafo, GrafoCompacto) and grafo._ordenados
+    if mesma_numeracao:
+        origem, destino = inicio, fim
+    else:
+        origem = hierarquia.indices[grafo.decodificar([inicio])[0]]
+        destino = hierarquia.indices[grafo.decodificar([fim])[0]]
+    caminho, custo, nos_expandidos, pico_fronteira = hierarquia.consultar(origem, destino)
     
+    if estatisticas is not None:
+        estatisticas['pico_fronteira'] = pico_fronteira
+    if caminho is not None and not mesma_numeracao:
+        caminho = [grafo.codificar(str(hierarquia.rotulos[no])) for no in caminho]
+    return caminho, custo, nos_expandidos
+
+# Replanejamento Incremental
+class BuscaIncremental:
+    """
+    Lifelong Planning A* (LPA*) entre `inicio` e `fim` fixos. Mantém g(v) e
+    rhs(v) entre chamadas; quando `atualizar_aresta`/`remover_aresta` altera o
+    grafo, só os vértices afetados voltam à fila e `calcular` reexpande apenas
+    o necessário para reparar a solução anterior.
+    `heuristica(v)` precisa ser consistente com os pesos atuais; o padrão é
+    h = 0 (Dijkstra incremental), que continua válido após qualquer alteração.
+    """
+    def __init__(self, grafo, inicio, fim, heuristica=None):
+        self.grafo = grafo
+        self.inicio = inicio
+        self.fim = fim
+        self.h = heuristica if heuristica is not None else (lambda v: 0)
+        self.g = {}
+        self.rhs = {inicio: 0}
+        self.fila = []
+        self.na_fila = {}
+        self.pendentes = set()
+        self.nos_expandidos = 0        # última chamada de `calcular`
+        self.nos_expandidos_total = 0  # desde a criação
+        self._enfileirar(inicio)
+        grafo.ouvintes.append(self._aresta_alterada)
+
+    def desconectar(self):
+        self.grafo.ouvintes.remove(self._aresta_alterada)
+
+    def _chave(self, v):
+        menor = min(self.g.get(v, float('inf')), self.rhs.get(v, float('inf')))
+        return menor + self.h(v), menor
+
+    def _enfileirar(self, v):
+        chave = self._chave(v)
+        self.na_fila[v] = chave
+        heapq.heappush(self.fila, (chave, v))
+
+    def _topo(self):
+        # remoções são preguiçosas: entradas cuja chave não confere são descartadas
+        while self.fila and self.na_fila.get(self.fila[0][1]) != self.fila[0][0]:
+            heapq.heappop(self.fila)
+        return self.fila[0] if self.fila else ((float('inf'), float('inf')), None)
+
+    def _atualizar_vertice(self, v):
+        if v != self.inicio:
+            self.rhs[v] = min((self.g.get(p, float('inf')) + peso
+                               for p, peso in self.grafo.vizinhos_reversos(v)), default=float('inf'))
+        self.na_fila.pop(v, None)
+        if self.g.get(v, float('inf')) != self.rhs.get(v, float('inf')):
+            self._enfileirar(v)
+
+    def _aresta_alterada(self, origem, destino):
+        self.pendentes.add(destino)
+
+    def calcular(self):
+        """
+        Repara (ou calcula, na primeira vez) o caminho mínimo.
+        Retorna (caminho, custo, nos_expandidos) como as demais buscas.
+        """
+        for v in self.pendentes:
+            self._atualizar_vertice(v)
+        self.pendentes.clear()
+        
+        self.nos_expandidos = 0
+        infinito = float('inf')
+        while True:
+            chave, u = self._topo()
+            if u is None or (chave >= self._chave(self.fim)
+                             and self.rhs.get(self.fim, infinito) == self.g.get(self.fim, infinito)):
+                break
+            heapq.heappop(self.fila)
+            del self.na_fila[u]
+            self.nos_expandidos += 1
+            
+            if self.g.get(u, infinito) > self.rhs.get(u, infinito):
+                self.g[u] = self.rhs[u]
+                for vizinho, _ in self.grafo.vizinhos(u):
+                    self._atualizar_vertice(vizinho)
+            else:
+                self.g[u] = infinito
+                self._atualizar_vertice(u)
+                for vizinho, _ in self.grafo.vizinhos(u):
+                    self._atualizar_vertice(vizinho)
+        
+        self.nos_expandidos_total += self.nos_expandidos
+        return self.caminho(), self.g.get(self.fim, infinito), self.nos_expandidos
+
+    def caminho(self):
+        """
+        Segue, a partir do fim, o predecessor que realiza g(v)
+        """
+        if self.g.get(self.fim, float('inf')) == float('inf'):
+            return None
+        caminho = [self.fim]
+        while caminho[-1] != self.inicio:
+            v = caminho[-1]
+            anterior, _ = min(((p, self.g.get(p, float('inf')) + peso)
+                               for p, peso in self.grafo.vizinhos_reversos(v)), key=lambda x: x[1])
+            caminho.append(anterior)
+        caminho.reverse()
+        return caminho
+
+    def comparar_com_rerun(self, algoritmo=None):
+        """
+        Compara a última reparação com uma busca refeita do zero
+        """
+        algoritmo = algoritmo or a_estrela
+        _, custo_rerun, nos_rerun = algoritmo(self.grafo, self.inicio, self.fim)
+        return {
+            'custo_incremental': self.g.get(self.fim, float('inf')),
+            'custo_rerun': custo_rerun,
+            'nos_reexpandidos': self.nos_expandidos,
+            'nos_expandidos_rerun': nos_rerun
+        }
+
+# Consultas em Lote
+def resolver_origem(grafo, origem, destinos):
+    """
+    Responde todas as consultas de uma mesma origem com uma única árvore de
+    caminhos mínimos. `origem`/`destinos` já codificados; o resultado de cada
+    destino tem o formato de `medir_desempenho`, com o tempo e os nós
+    expandidos da árvore compartilhada (o tempo é dividido entre os destinos).
+    Os contadores que a árvore não informa voltam como None.
+    """
+    inicio_tempo = time.perf_counter()
+    distancias, predecessores, nos_expandidos, pico_fronteira = arvore_caminhos_minimos(grafo, origem, destinos)
+    tempo_execucao = (time.perf_counter() - inicio_tempo) / max(len(destinos), 1)
+    
+    resultados = {}
+    for destino in destinos:
+        alcancado = destino in predecessores
+        caminho = reconstruir_caminho(predecessores, origem, destino) if alcancado else None
+        resultados[destino] = {
+            'caminho': grafo.decodificar(caminho) if caminho else [],
+            'custo': distancias[destino] if alcancado else float('inf'),
+            'tempo': tempo_execucao,
+            'nos_expandidos': nos_expandidos,
+            'pico_fronteira': pico_fronteira,
+            'insercoes': None,
+            'remocoes': None,
+            'duplicadas': None,
+            'podadas': None,
+            'memoria_pico_kb': None
+        }
+    return resultados
+
+def existe_vertice(grafo, rotulo):
+    """
+    Se o rótulo é um vértice do grafo (GrafoCompacto.codificar levanta KeyError)
+    """
+    try:
+        return grafo.codificar(rotulo) in grafo.vertices
+    except KeyError:
+        return False
+
+def resultado_sem_caminho():
+    """
+    Resultado de uma consulta que não rodou (vértice inexistente)
+    """
+    return {'caminho': [], 'custo': float('inf'), 'tempo': 0.0, 'nos_expandidos': 0, 'pico_fronteira': 0,
+            'insercoes': None, 'remocoes': None, 'duplicadas': None, 'podadas': None, 'memoria_pico_kb': None}
+
+def compartilhar_grafo(grafo):
+    """
+    Copia os arrays CSR para blocos de memória compartilhada. Retorna os
+    blocos (para liberar depois) e o descritor que os processos usam para
+    remontar o grafo sem copiá-lo.
+    """
+    from multiprocessing import shared_memory
+    
+    blocos = []
+    descritor = {}
+    arrays = {'rotulos': grafo.rotulos, 'offsets': grafo.offsets,
+              'destinos': grafo.destinos, 'pesos': grafo.pesos}
+    for nome, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        bloco = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=bloco.buf)[...] = array
+        blocos.append(bloco)
+        descritor[nome] = (bloco.name, array.shape, array.dtype.str)
+    return blocos, descritor
+
+_grafo_processo = None
+_blocos_processo = []
+
+def _iniciar_processo_lote(descritor):
+    from multiprocessing import shared_memory
+    
+    global _grafo_processo
+    arrays = {}
+    for nome, (bloco_nome, forma, tipo) in descritor.items():
+        bloco = shared_memory.SharedMemory(name=bloco_nome)
+        _blocos_processo.append(bloco)  # mantém o mapeamento vivo enquanto o processo existir
+        arrays[nome] = np.ndarray(forma, dtype=np.dtype(tipo), buffer=bloco.buf)
+    _grafo_processo = GrafoCompacto(arrays['rotulos'], arrays['offsets'], arrays['destinos'], arrays['pesos'])
+
+def _resolver_origem_processo(origem, destinos):
+    return origem, resolver_origem(_grafo_processo, origem, destinos)
+
+def consultar_em_lote(grafo, consultas, processos=None):
+    """
+    Responde muitos pares (inicio, fim), em rótulos, sobre o mesmo grafo.
+    As consultas são agrupadas por origem e cada origem roda um único Dijkstra
+    um-para-muitos. Com `processos` > 1, as origens são distribuídas num pool
+    de processos que acessam o grafo (em CSR) por memória compartilhada.
+    Retorna {(inicio, fim): resultado no formato de `medir_desempenho`};
+    rótulos que não existem no grafo dão um resultado sem caminho.
+    """
+    resultados = {}
+    por_origem = {}
+    for inicio, fim in consultas:
+        if existe_vertice(grafo, inicio) and existe_vertice(grafo, fim):
+            por_origem.setdefault(inicio, []).append(fim)
+        else:
+            resultados[(inicio, fim)] = resultado_sem_caminho()
+    
+    if not processos or processos <= 1:
+        for inicio, fins in por_origem.items():
+            codigos = {grafo.codificar(fim): fim for fim in fins}
+            respostas = resolver_origem(grafo, grafo.codificar(inicio), list(codigos))
+            for codigo, fim in codigos.items():
+                resultados[(inicio, fim)] = respostas[codigo]
+        return resultados
+    
+    from concurrent.futures import ProcessPoolExecutor
+    
+    grafo = grafo.compactar()
+    blocos, descritor = compartilhar_grafo(grafo)
+    try:
+        with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo_lote,
+                                 initargs=(descritor,)) as executor:
+            tarefas = []
+            for inicio, fins in por_origem.items():
+                destinos = sorted({grafo.codificar(fim) for fim in fins})
+                tarefas.append(executor.submit(_resolver_origem_processo, grafo.codificar(inicio), destinos))
+            
+            for tarefa in tarefas:
+                origem, respostas = tarefa.result()
+                inicio = grafo.decodificar([origem])[0]
+                for destino, resposta in respostas.items():
+                    resultados[(inicio, grafo.decodificar([destino])[0])] = resposta
+    finally:
+        for bloco in blocos:
+            bloco.close()
+            bloco.unlink()
+    
+    return resultados
+
+# Execução dos Testes
+# Teto de nós expandidos para IDDFS/IDA* em executar_testes: acima dele a
+# busca é dada como falha em vez de travar a comparação
+LIMITE_NOS_APROFUNDAMENTO = 5_000_000
+# Entradas da tabela de transposição de IDDFS/IDA* em executar_testes (as
+# funções usam 0 por padrão, só memória O(profundidade))
+TAMANHO_TRANSPOSICAO = 100_000
+
+def algoritmos_de_teste(fila_prioridade='heapq', hierarquia=False, medir_memoria=False, aprofundamento=False):
+    """
+    Algoritmos comparados em executar_testes, na ordem do relatório. IDDFS e
+    IDA* só entram com `aprofundamento`: mesmo com a tabela de transposição,
+    o IDA* faz uma iteração por valor distinto de f e não escala como o A*.
+    """
+    # pico de memória só nas buscas que aceitam rastreador
+    rastreio = {'rastreador': Rastreador(memoria=True)} if medir_memoria else {}
+    algoritmos = {
+        'BFS': partial(bfs, **rastreio),
+        'DFS': partial(dfs, **rastreio),
+        'Gulosa': partial(busca_gulosa, fila_prioridade=fila_prioridade, **rastreio),
+        'A*': partial(a_estrela, fila_prioridade=fila_prioridade, **rastreio),
+        'Bidirecional': busca_bidirecional,
+        'A* Bidirecional': a_estrela_bidirecional,
+    }
+    if aprofundamento:
+        limites = {'tamanho_transposicao': TAMANHO_TRANSPOSICAO, 'limite_nos': LIMITE_NOS_APROFUNDAMENTO}
+        algoritmos['IDDFS'] = partial(aprofundamento_iterativo, **limites)
+        algoritmos['IDA*'] = partial(ida_estrela, **limites)
+    if hierarquia:
+        algoritmos['CH'] = busca_ch
+    return algoritmos
+
+# Algoritmos de executar_testes que usam a heurística ALT quando há landmarks
+ALGORITMOS_ALT = ('Gulosa', 'A*', 'A* Bidirecional', 'IDA*')
+
+# Grafos já carregados no processo que executa os trabalhos (o principal ou
+# cada processo do pool), com o pré-processamento e os nós de teste
+_grafos_teste = {}
+
+def preparar_grafo_teste(arquivo, compacto=False, landmarks=0, hierarquia=False):
+    """
+    Carrega e pré-processa o grafo uma vez por processo; os trabalhos
+    seguintes do mesmo grafo o reaproveitam. preparo['por_algoritmo'] leva
+    o tempo de pré-processamento ao nome de cada algoritmo que o usa.
+    """
+    chave = (arquivo, compacto, landmarks, hierarquia)
+    if chave not in _grafos_teste:
+        grafo = GrafoCompacto.de_arquivo(arquivo) if compacto else Grafo(arquivo)
+        preparo = {'por_algoritmo': {}}
+        inicio = fim = None
+        if grafo.num_arestas:
+            if landmarks:
+                inicio_preparo = time.perf_counter()
+                grafo.preparar_landmarks(landmarks)
+                preparo['Landmarks'] = time.perf_counter() - inicio_preparo
+                preparo['por_algoritmo'].update(dict.fromkeys(ALGORITMOS_ALT, preparo['Landmarks']))
+            if hierarquia:
+                preparo['CH'] = grafo.preparar_hierarquia(caminho_cache(arquivo) + '.ch.npz')
+                preparo['atalhos'] = grafo.hierarquia.num_atalhos
+                preparo['por_algoritmo']['CH'] = preparo['CH']
+            nos = sorted(grafo.rotulos, key=lambda x: int(x))  # Ordena nós numericamente
+            inicio, fim = nos[0], nos[-1]
+        _grafos_teste[chave] = grafo, inicio, fim, preparo
+    return _grafos_teste[chave]
+
+def executar_trabalho(arquivo, nome, configuracao):
+    """
+    Um trabalho de executar_testes: roda o algoritmo `nome` no grafo de
+    `arquivo`. Erros voltam no resultado para o processo principal reportar.
+    """
+    try:
+        grafo, inicio, fim, preparo = preparar_grafo_teste(arquivo, configuracao['compacto'],
+                                                           configuracao['landmarks'],
+                                                           configuracao['hierarquia'])
+        if not grafo.num_arestas:
+            return {'vazio': True}
+        algoritmo = algoritmos_de_teste(configuracao['fila_prioridade'], configuracao['hierarquia'],
+                                        configuracao['medir_memoria'], configuracao['aprofundamento'])[nome]
+        resultado = medir_desempenho(algoritmo, grafo, inicio, fim)
+        return {**resultado, 'inicio': inicio, 'fim': fim, 'preparo': preparo}
+    except Exception as e:
+        return {'erro': str(e)}
+
+def executar_testes(compacto=False, fila_prioridade='heapq', landmarks=0, hierarquia=False,
+                    medir_memoria=False, processos=1, aprofundamento=False):
+    """
+    Roda cada algoritmo em cada grafo_N. Com `processos` > 1 (ou None, um
+    por CPU) os pares (grafo, algoritmo) são distribuídos num pool de
+    processos e cada processo carrega cada grafo uma única vez. Os tempos
+    medidos em paralelo disputam CPU entre si: compare-os só dentro da
+    mesma execução.
+    """
+    import pandas as pd
+    
+    configuracao = {'compacto': compacto, 'fila_prioridade': fila_prioridade, 'landmarks': landmarks,
+                    'hierarquia': hierarquia, 'medir_memoria': medir_memoria,
+                    'aprofundamento': aprofundamento}
+    nomes = list(algoritmos_de_teste(fila_prioridade, hierarquia, aprofundamento=aprofundamento))
+    
+    arquivos = []
     for i in range(1, 11):
         arquivo = f'grafos/grafo_{i}.xlsx'
         
         if not os.path.exists(arquivo):
             print(f"⚠️ Arquivo {arquivo} não encontrado! Pulando...")
             continue
-            
-        try:
+        arquivos.append((i, arquivo))
+    
+    trabalhos = [(arquivo, nome) for _, arquivo in arquivos for nome in nomes]
+    executor = None
+    if processos == 1 or not trabalhos:
+        respostas = (executar_trabalho(arquivo, nome, configuracao) for arquivo, nome in trabalhos)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        executor = ProcessPoolExecutor(max_workers=processos)
+        futuros = [executor.submit(executar_trabalho, arquivo, nome, configuracao)
+                   for arquivo, nome in trabalhos]
+        
+        def resposta(futuro):
+            # falhas do próprio pool (processo morto, resultado não serializável)
+            # viram o erro só deste trabalho, como no laço sequencial
+            try:
+                return futuro.result()
+            except Exception as e:
+                return {'erro': f"{type(e).__name__}: {str(e)}"}
+        
+        respostas = map(resposta, futuros)
+    
+    resultados = []
+    try:
+        for i, arquivo in arquivos:
             print(f"\n🔍 Processando {arquivo}...")
-            grafo = Grafo(arquivo)
-            
-            if not grafo.arestas:
-                print(f"⚠️ Grafo {i} vazio ou inválido! Pulando...")
-                continue
+            custos = {}
+            cabecalho = False
+            for nome in nomes:
+                resultado = next(respostas)
+                if 'vazio' in resultado:
+                    print(f"⚠️ Grafo {i} vazio ou inválido! Pulando...")
+                    break
+                if 'erro' in resultado:
+                    print(f"❌ Erro no grafo {i} ({nome}): {resultado['erro']}")
+                    continue
+                
+                preparo = resultado['preparo']
+                if not cabecalho:
+                    if 'Landmarks' in preparo:
+                        print(f"  Landmarks ALT ({landmarks}) preparados em {preparo['Landmarks']:.4f}s")
+                    if 'CH' in preparo:
+                        print(f"  Hierarquia de contração pronta em {preparo['CH']:.4f}s "
+                              f"({preparo['atalhos']} atalhos)")
+                    print(f"  Nó inicial: {resultado['inicio']}, Nó final: {resultado['fim']}")
+                    cabecalho = True
                 
-            nos = sorted(grafo.vertices, key=lambda x: int(x))  # Ordena nós numericamente
-            inicio, fim = nos[0], nos[-1]
-            print(f"  Nó inicial: {inicio}, Nó final: {fim}")
-            
-            algoritmos = [
-                ('BFS', bfs),
-                ('DFS', dfs),
-                ('Gulosa', busca_gulosa),
-                ('A*', a_estrela)
-            ]
-            
-            for nome, algoritmo in algoritmos:
-                print(f"  Executando {nome}...", end=' ')
-                resultado = medir_desempenho(algoritmo, grafo, inicio, fim)
                 status = "✅" if resultado['caminho'] else "❌"
-                print(f"{status} Custo: {resultado['custo']}, Nós: {resultado['nos_expandidos']}")
+                print(f"  Executando {nome}... {status} Custo: {resultado['custo']}, "
+                      f"Nós: {resultado['nos_expandidos']}")
+                custos[nome] = resultado['custo']
                 
                 resultados.append({
                     'Grafo': f'grafo_{i}',
                     'Algoritmo': nome,
-                    'Tempo (s)': round(resultado['tempo'], 4),
+                    'Tempo (s)': resultado['tempo'],
                     'Custo': resultado['custo'],
                     'Nós Expandidos': resultado['nos_expandidos'],
+                    'Pico Fronteira': resultado['pico_fronteira'],
+                    'Inserções': resultado['insercoes'],
+                    'Remoções': resultado['remocoes'],
+                    'Duplicadas': resultado['duplicadas'],
+                    'Podadas': resultado['podadas'],
+                    'Memória Pico (KiB)': resultado['memoria_pico_kb'],
+                    'Pré-processamento (s)': preparo['por_algoritmo'].get(nome, 0.0),
                     'Caminho': '→'.join(resultado['caminho']) if resultado['caminho'] else 'N/A'
                 })
-                
-        except Exception as e:
-            print(f"❌ Erro no grafo {i}: {str(e)}")
+            else:
+                # o for terminou sem break: todos os trabalhos do grafo foram consumidos
+                if 'CH' in custos and 'A*' in custos:
+                    # atalhos somam os pesos em outra ordem: igualdade exata falharia com floats
+                    confere = math.isclose(custos['CH'], custos['A*'], rel_tol=1e-9, abs_tol=1e-9)
+                    print(f"  {'✅' if confere else '❌'} Custo CH {'confere com' if confere else 'difere do'} A* "
+                          f"({custos['CH']} x {custos['A*']})")
+                continue
+            # grafo vazio: descarta as respostas restantes dele
+            for _ in range(len(nomes) - nomes.index(nome) - 1):
+                next(respostas)
+    finally:
+        if executor is not None:
+            executor.shutdown()
     
     return pd.DataFrame(resultados)
 
-def gerar_relatorio(df):
+def gerar_relatorio(df, graficos=True, dpi=300):
+    """
+    Grava resultados.csv e, com `graficos`, renderiza resultados.png. A
+    figura é a etapa cara do relatório e pode ser pulada ou gerada depois
+    a partir do CSV (ver --relatorio). Sem pyplot já em uso, renderiza
+    com o backend Agg, que não precisa de janela.
+    """
     if df.empty:
         print("❌ Nenhum dado para gerar relatório!")
         return
     
     print("\n📊 Gerando relatório...")
     
-    plt.figure(figsize=(15, 10))
-    plt.suptitle("Comparação de Algoritmos de Busca")
-    
-    # Tempo de Execução
-    plt.subplot(2, 2, 1)
-    df.groupby('Algoritmo')['Tempo (s)'].mean().plot.bar(color='skyblue')
-    plt.title("Tempo Médio de Execução (s)")
-    plt.ylabel("Segundos")
-    
-    # Custo do Caminho
-    plt.subplot(2, 2, 2)
-    df.groupby('Algoritmo')['Custo'].mean().plot.bar(color='lightgreen')
-    plt.title("Custo Médio do Caminho")
-    plt.ylabel("Soma dos Pesos")
-    
-    # Nós Expandidos
-    plt.subplot(2, 2, 3)
-    df.groupby('Algoritmo')['Nós Expandidos'].mean().plot.bar(color='salmon')
-    plt.title("Nós Expandidos (Média)")
-    plt.ylabel("Quantidade")
-    
-    # Exemplo de Caminho
-    plt.subplot(2, 2, 4)
-    sample = df[df['Caminho'] != 'N/A'].iloc[0]
-    plt.text(0.1, 0.5, f"Exemplo de caminho ({sample['Algoritmo']}):\n{sample['Caminho']}", 
-             fontsize=10)
-    plt.axis('off')
-    
-    plt.tight_layout()
-    plt.savefig('resultados.png', dpi=300)
     df.to_csv('resultados.csv', index=False)
+    arquivos = ["- resultados.csv (Dados completos)"]
+    
+    if graficos:
+        import sys
+        import matplotlib
+        if 'matplotlib.pyplot' not in sys.modules:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        
+        plt.figure(figsize=(15, 10))
+        plt.suptitle("Comparação de Algoritmos de Busca")
+        
+        # Tempo de Execução
+        plt.subplot(2, 2, 1)
+        df.groupby('Algoritmo')['Tempo (s)'].mean().plot.bar(color='skyblue')
+        plt.title("Tempo Médio de Execução (s)")
+        plt.ylabel("Segundos")
+        
+        # Custo do Caminho
+        plt.subplot(2, 2, 2)
+        df.groupby('Algoritmo')['Custo'].mean().plot.bar(color='lightgreen')
+        plt.title("Custo Médio do Caminho")
+        plt.ylabel("Soma dos Pesos")
+        
+        # Nós Expandidos e movimento da fronteira
+        plt.subplot(2, 2, 3)
+        df.groupby('Algoritmo')[['Nós Expandidos', 'Inserções', 'Duplicadas']].mean().plot.bar(
+            ax=plt.gca(), color=['salmon', 'khaki', 'plum'])
+        plt.title("Nós Expandidos e Fronteira (Média)")
+        plt.ylabel("Quantidade")
+        
+        # Exemplo de Caminho
+        plt.subplot(2, 2, 4)
+        sample = df[df['Caminho'] != 'N/A'].iloc[0]
+        plt.text(0.1, 0.5, f"Exemplo de caminho ({sample['Algoritmo']}):\n{sample['Caminho']}", 
+                 fontsize=10)
+        plt.axis('off')
+        
+        plt.tight_layout()
+        plt.savefig('resultados.png', dpi=dpi)
+        plt.close()
+        arquivos.insert(0, "- resultados.png (Gráficos comparativos)")
     
     print("✅ Relatório gerado com sucesso!")
     print("📁 Arquivos criados:")
-    print("- resultados.png (Gráficos comparativos)")
-    print("- resultados.csv (Dados completos)")
+    for arquivo in arquivos:
+        print(arquivo)
 
 if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Comparação de algoritmos de busca")
+    parser.add_argument('--processos', type=int, default=1,
+                        help="processos que executam os pares (grafo, algoritmo) (0 = um por CPU)")
+    parser.add_argument('--compacto', action='store_true', help="carrega os grafos em CSR")
+    parser.add_argument('--sem-graficos', action='store_true',
+                        help="grava só resultados.csv, sem renderizar a figura")
+    parser.add_argument('--relatorio', metavar='CSV',
+                        help="não executa as buscas: só renderiza o relatório de um CSV já gerado")
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--aprofundamento', action='store_true',
+                        help=f"inclui IDDFS e IDA* (limitados a {LIMITE_NOS_APROFUNDAMENTO} nós expandidos)")
+    parser.add_argument('--hierarquia', action='store_true',
+                        help="inclui a busca em hierarquia de contração (CH) ao lado do A*")
+    parser.add_argument('--landmarks', type=int, default=0, metavar='K',
+                        help="prepara K landmarks para a heurística ALT (0 = heurística constante)")
+    args = parser.parse_args()
+    if args.landmarks < 0:
+        parser.error("--landmarks deve ser >= 0")
+    
+    if args.relatorio:
+        import pandas as pd
+        gerar_relatorio(pd.read_csv(args.relatorio), dpi=args.dpi)
+        raise SystemExit
+    
     print("🚀 Iniciando análise de algoritmos de busca...")
     print("📌 Formato esperado dos grafos: No_Origem, No_Destino, Peso\n")
     
-    df = executar_testes()
+    df = executar_testes(compacto=args.compacto, processos=args.processos or None,
+                         aprofundamento=args.aprofundamento, hierarquia=args.hierarquia,
+                         landmarks=args.landmarks)
     
     if not df.empty:
         print("\n📋 Resultados sumarizados:")
         print(df[['Grafo', 'Algoritmo', 'Custo', 'Tempo (s)', 'Nós Expandidos']].to_string(index=False))
-        gerar_relatorio(df)
+        gerar_relatorio(df, graficos=not args.sem_graficos, dpi=args.dpi)
     else:
         print("❌ Nenhum resultado válido foi gerado. Verifique:")
         print("- Os arquivos estão na pasta 'grafos' (grafo_1.xlsx a grafo_10.xlsx)")
         print("- As colunas são exatamente: No_Origem, No_Destino, Peso")
-        print("- Os arquivos estão no formato .xlsx (Excel)")
\ No newline at end of file
+        print("- Os arquivos estão no formato .xlsx (Excel)")
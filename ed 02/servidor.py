@@ -0,0 +1,169 @@
+"""
+Servidor local de consultas de caminho: mantém os grafos carregados entre
+as consultas em vez de reler os arquivos a cada execução de codigo.py.
+
+Uso:
+    python servidor.py [--host 127.0.0.1] [--porta 8765] [--socket caminho.sock]
+                       [--processos N] [--compacto] [--tamanho-cache N]
+
+Protocolo: uma linha JSON por consulta, uma linha JSON por resposta.
+    {"grafo": "grafos/grafo_3.xlsx", "algoritmo": "a_estrela", "inicio": "0", "fim": "6"}
+    -> {"caminho": ["0", "2", "6"], "custo": 22.0, "tempo": ..., "nos_expandidos": 8,
+        "pico_fronteira": 6, "cache": false}
+Erros voltam como {"erro": "mensagem"}.
+"""
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from codigo import (Grafo, GrafoCompacto, medir_desempenho, bfs, dfs, busca_gulosa,
+                    a_estrela, busca_bidirecional, a_estrela_bidirecional)
+
+ALGORITMOS = {
+    'bfs': bfs,
+    'dfs': dfs,
+    'busca_gulosa': busca_gulosa,
+    'a_estrela': a_estrela,
+    'busca_bidirecional': busca_bidirecional,
+    'a_estrela_bidirecional': a_estrela_bidirecional,
+}
+
+# Grafos carregados no processo que executa as buscas (o próprio servidor
+# ou cada processo do pool), chaveados pela assinatura do arquivo
+_grafos_carregados = {}
+
+def assinatura_arquivo(arquivo):
+    info = os.stat(arquivo)
+    return info.st_size, info.st_mtime_ns
+
+def obter_grafo(arquivo, assinatura, compacto):
+    """
+    Carrega o grafo uma vez por versão do arquivo e o reaproveita depois
+    """
+    chave = (arquivo, compacto)
+    carregado = _grafos_carregados.get(chave)
+    if carregado is None or carregado[0] != assinatura:
+        grafo = GrafoCompacto.de_arquivo(arquivo) if compacto else Grafo(arquivo)
+        _grafos_carregados[chave] = (assinatura, grafo)
+    return _grafos_carregados[chave][1]
+
+def executar_consulta(arquivo, assinatura, compacto, algoritmo, inicio, fim):
+    grafo = obter_grafo(arquivo, assinatura, compacto)
+    if not grafo.num_arestas:
+        raise ValueError(f"Grafo {arquivo} vazio ou inválido")
+    resultado = medir_desempenho(ALGORITMOS[algoritmo], grafo, inicio, fim)
+    # JSON não tem infinito: caminho inexistente volta com custo null
+    if resultado['custo'] == float('inf'):
+        resultado['custo'] = None
+    return resultado
+
+class ServidorCaminhos:
+    """
+    Atende consultas por algoritmo com um cache LRU de resultados. A chave
+    do cache inclui tamanho e mtime do arquivo, e as entradas de um grafo
+    são descartadas assim que o arquivo muda. As buscas rodam num pool de
+    processos (ou numa única thread, com processos=0) para não bloquear
+    o laço de eventos.
+    """
+    def __init__(self, processos=None, compacto=False, tamanho_cache=1024):
+        self.compacto = compacto
+        self.tamanho_cache = tamanho_cache
+        self.cache = OrderedDict()
+        self.assinaturas = {}
+        if processos == 0:
+            # uma thread só: as buscas alteram grafo.heuristica e não podem correr em paralelo
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self.executor = ProcessPoolExecutor(max_workers=processos)
+
+    def _invalidar(self, arquivo, assinatura):
+        if self.assinaturas.get(arquivo) != assinatura:
+            for chave in [chave for chave in self.cache if chave[0] == arquivo]:
+                del self.cache[chave]
+            self.assinaturas[arquivo] = assinatura
+
+    async def responder(self, consulta):
+        try:
+            arquivo = consulta['grafo']
+            algoritmo = consulta['algoritmo']
+            inicio, fim = str(consulta['inicio']), str(consulta['fim'])
+        except (KeyError, TypeError):
+            return {'erro': "A consulta deve conter grafo, algoritmo, inicio e fim"}
+        if not isinstance(arquivo, str) or not isinstance(algoritmo, str):
+            return {'erro': "grafo e algoritmo devem ser textos"}
+
+        if algoritmo not in ALGORITMOS:
+            return {'erro': f"Algoritmo desconhecido: {algoritmo} (use {', '.join(ALGORITMOS)})"}
+
+        try:
+            assinatura = assinatura_arquivo(arquivo)
+        except OSError:
+            return {'erro': f"Arquivo {arquivo} não encontrado"}
+
+        self._invalidar(arquivo, assinatura)
+        chave = (arquivo, assinatura, algoritmo, inicio, fim)
+        if chave in self.cache:
+            self.cache.move_to_end(chave)
+            return {**self.cache[chave], 'cache': True}
+
+        laco = asyncio.get_running_loop()
+        try:
+            resultado = await laco.run_in_executor(self.executor, executar_consulta, arquivo,
+                                                   assinatura, self.compacto, algoritmo, inicio, fim)
+        except Exception as e:
+            return {'erro': f"{type(e).__name__}: {str(e)}"}
+
+        self.cache[chave] = resultado
+        if len(self.cache) > self.tamanho_cache:
+            self.cache.popitem(last=False)
+        return {**resultado, 'cache': False}
+
+    async def atender(self, leitor, escritor):
+        try:
+            while linha := await leitor.readline():
+                try:
+                    consulta = json.loads(linha)
+                except json.JSONDecodeError:
+                    resposta = {'erro': "Consulta não é um JSON válido"}
+                else:
+                    resposta = await self.responder(consulta)
+                escritor.write(json.dumps(resposta, ensure_ascii=False).encode() + b'\n')
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def servir(self, host='127.0.0.1', porta=8765, socket=None):
+        if socket:
+            servidor = await asyncio.start_unix_server(self.atender, path=socket)
+            print(f"🚀 Servidor ouvindo em {socket}")
+        else:
+            servidor = await asyncio.start_server(self.atender, host, porta)
+            print(f"🚀 Servidor ouvindo em {host}:{porta}")
+
+        try:
+            async with servidor:
+                await servidor.serve_forever()
+        finally:
+            self.executor.shutdown(cancel_futures=True)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servidor de consultas de caminho")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--socket', help="caminho de um socket Unix (substitui host/porta)")
+    parser.add_argument('--processos', type=int, default=None,
+                        help="processos do pool de buscas (0 = uma thread no próprio servidor)")
+    parser.add_argument('--compacto', action='store_true', help="carrega os grafos em CSR")
+    parser.add_argument('--tamanho-cache', type=int, default=1024)
+    args = parser.parse_args()
+
+    servidor = ServidorCaminhos(args.processos, args.compacto, args.tamanho_cache)
+    try:
+        asyncio.run(servidor.servir(args.host, args.porta, args.socket))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado")
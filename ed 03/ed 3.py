@@ -1,7 +1,12 @@
+import contextlib
+import io
+import json
+import os
+import time
 import pandas as pd
 import random
 import numpy as np
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 def carregar_instancia(nome_arquivo):
     try:
@@ -19,15 +24,85 @@ def carregar_instancia(nome_arquivo):
         print(f"Erro ao processar {nome_arquivo}: {e}")
         return [], 0
 
-def calcular_fitness(individuo, itens, capacidade):
+def somar_itens(individuo, itens):
     peso_total = 0
     valor_total = 0
     for i in range(len(individuo)):
         if individuo[i] == 1:
             peso_total += itens[i][0]
             valor_total += itens[i][1]
+    return valor_total, peso_total
+
+def calcular_fitness(individuo, itens, capacidade):
+    valor_total, peso_total = somar_itens(individuo, itens)
     return (0, 0) if peso_total > capacidade else (valor_total, peso_total)
 
+class AvaliadorFitness:
+    """
+    Avalia indivíduos do motor de listas guardando o (valor, peso) bruto,
+    sem o corte pela capacidade, que pode vir:
+      - do pai, ajustado só nos genes que a mutação alterou (delta)
+      - de um cache LRU com até `tamanho_cache` cromossomos (chave: bytes do indivíduo)
+      - da soma de todos os itens, quando nenhum dos dois serve
+    """
+    def __init__(self, itens, capacidade, tamanho_cache=0):
+        self.itens = itens
+        self.capacidade = capacidade
+        self.tamanho_cache = tamanho_cache
+        self.cache = OrderedDict()
+        self.avaliacoes = 0
+        self.incrementais = 0
+        self.consultas_cache = 0
+        self.acertos_cache = 0
+
+    def fitness(self, bruto):
+        valor_total, peso_total = bruto
+        return (0, 0) if peso_total > self.capacidade else (valor_total, peso_total)
+
+    def delta(self, bruto_pai, pai, filho, posicoes):
+        """
+        (valor, peso) do filho a partir do pai, olhando só as posições alteradas
+        """
+        valor_total, peso_total = bruto_pai
+        for i in set(posicoes):
+            diferenca = filho[i] - pai[i]
+            if diferenca:
+                peso_total += diferenca * self.itens[i][0]
+                valor_total += diferenca * self.itens[i][1]
+        return valor_total, peso_total
+
+    def avaliar(self, individuo, bruto=None):
+        self.avaliacoes += 1
+        if bruto is not None:
+            self.incrementais += 1
+        if not self.tamanho_cache:
+            return bruto if bruto is not None else somar_itens(individuo, self.itens)
+        
+        chave = bytes(individuo)
+        if chave in self.cache:
+            self.cache.move_to_end(chave)
+            if bruto is None:
+                self.consultas_cache += 1
+                self.acertos_cache += 1
+                bruto = self.cache[chave]
+            return bruto
+        
+        if bruto is None:
+            self.consultas_cache += 1
+            bruto = somar_itens(individuo, self.itens)
+        self.cache[chave] = bruto
+        if len(self.cache) > self.tamanho_cache:
+            self.cache.popitem(last=False)
+        return bruto
+
+    def imprimir_estatisticas(self):
+        poupadas = self.incrementais + self.acertos_cache
+        taxa_acerto = self.acertos_cache / self.consultas_cache if self.consultas_cache else 0
+        print(f"Avaliações de fitness: {self.avaliacoes} | incrementais: {self.incrementais} | "
+              f"acertos no cache: {self.acertos_cache}/{self.consultas_cache} ({taxa_acerto:.1%})")
+        print(f"Avaliações completas poupadas: {poupadas} "
+              f"({poupadas / self.avaliacoes if self.avaliacoes else 0:.1%})")
+
 def inicializar_populacao_aleatoria(tamanho_populacao, num_itens):
     return [[random.randint(0, 1) for _ in range(num_itens)] for _ in range(tamanho_populacao)]
 
@@ -75,6 +150,48 @@ def selecionar_torneio(populacao, fitness_populacao, tamanho_torneio=3):
         selecionados.append(vencedor[0])
     return selecionados
 
+# Seleção em lote: sorteia os índices de todos os pares (pai, mãe) da
+# geração de uma vez e serve tanto para populações em lista quanto em matriz
+def valores_fitness(fitness_populacao):
+    """
+    Valores de fitness como array, aceitando a lista de (valor, peso)
+    """
+    if isinstance(fitness_populacao, np.ndarray):
+        return fitness_populacao
+    return np.array([f[0] for f in fitness_populacao])
+
+def selecionar_roleta_em_lote(fitness_populacao, num_pares, rng):
+    """
+    Roleta com os pesos acumulados calculados uma vez por geração: cada
+    sorteio é uma busca binária (searchsorted) em vez de uma nova lista de
+    probabilidades por par
+    """
+    fitness = valores_fitness(fitness_populacao)
+    acumulado = np.cumsum(fitness)
+    if acumulado[-1] == 0:
+        return rng.integers(0, len(fitness), (num_pares, 2))
+    # side='right' nunca escolhe indivíduos de fitness zero
+    sorteios = rng.random((num_pares, 2)) * acumulado[-1]
+    return np.minimum(np.searchsorted(acumulado, sorteios, side='right'), len(fitness) - 1)
+
+def selecionar_torneio_em_lote(fitness_populacao, num_pares, rng, tamanho_torneio=3):
+    """
+    Um torneio por linha de uma matriz de índices de competidores. Linhas
+    com competidor repetido são sorteadas de novo, para que cada torneio
+    tenha indivíduos distintos como em random.sample.
+    """
+    fitness = valores_fitness(fitness_populacao)
+    tamanho_torneio = min(tamanho_torneio, len(fitness))
+    competidores = rng.integers(0, len(fitness), (num_pares * 2, tamanho_torneio))
+    while True:
+        ordenados = np.sort(competidores, axis=1)
+        repetidos = (ordenados[:, 1:] == ordenados[:, :-1]).any(axis=1)
+        if not repetidos.any():
+            break
+        competidores[repetidos] = rng.integers(0, len(fitness), (repetidos.sum(), tamanho_torneio))
+    vencedores = competidores[np.arange(len(competidores)), np.argmax(fitness[competidores], axis=1)]
+    return vencedores.reshape(num_pares, 2)
+
 def cruzar_um_ponto(pai, mae):
     ponto_corte = random.randint(1, len(pai)-1)
     filho1 = pai[:ponto_corte] + mae[ponto_corte:]
@@ -110,6 +227,285 @@ def mutar_troca(individuo, taxa_mutacao):
             individuo[i], individuo[j] = individuo[j], individuo[i]
     return individuo
 
+# Variantes que também devolvem as posições alteradas, para a avaliação
+# incremental; fazem os mesmos sorteios, na mesma ordem, das originais
+def mutar_binaria_rastreada(individuo, taxa_mutacao):
+    mutado = individuo.copy()
+    posicoes = [i for i in range(len(individuo)) if random.random() < taxa_mutacao]
+    for i in posicoes:
+        mutado[i] = 1 - mutado[i]
+    return mutado, posicoes
+
+def mutar_troca_rastreada(individuo, taxa_mutacao):
+    posicoes = []
+    for i in range(len(individuo)):
+        if random.random() < taxa_mutacao:
+            j = random.randint(0, len(individuo)-1)
+            individuo[i], individuo[j] = individuo[j], individuo[i]
+            posicoes.extend((i, j))
+    return individuo, posicoes
+
+# Limites e Solução Exata
+def limite_superior_fracionario(itens, capacidade):
+    """
+    Limite da relaxação linear: itens inteiros em ordem de valor/peso e uma
+    fração do primeiro que não cabe. Com valores inteiros o ótimo é no
+    máximo o piso deste limite.
+    """
+    limite = 0
+    restante = capacidade
+    for peso, valor in sorted(itens, key=lambda item: item[1] / item[0] if item[0] else float('inf'),
+                              reverse=True):
+        if peso <= restante:
+            restante -= peso
+            limite += valor
+        else:
+            limite += valor * restante / peso
+            break
+    return limite
+
+def valor_alvo(itens, capacidade, config):
+    """
+    Valor que encerra a evolução assim que o melhor fitness o alcança:
+      - criterio_parada 'limite_superior': limite da relaxação linear, calculado
+        uma vez na inicialização (o AG para quando prova ter achado o ótimo)
+      - criterio_parada 'alvo': config['valor_alvo'] (por exemplo, o ótimo exato)
+    """
+    criterio_parada = config.get('criterio_parada', 'geracoes')
+    if criterio_parada == 'alvo':
+        return config['valor_alvo']
+    if criterio_parada != 'limite_superior':
+        return None
+    limite = limite_superior_fracionario(itens, capacidade)
+    if all(float(valor).is_integer() for _, valor in itens):
+        limite = int(limite + 1e-9)
+    return limite
+
+def resolver_programacao_dinamica(pesos, valores, capacidade):
+    """
+    Programação dinâmica sobre a capacidade, vetorizada: cada item atualiza
+    o vetor de melhores valores inteiro de uma vez. As decisões ficam
+    guardadas em bits (um bit por item e capacidade) para reconstruir a
+    solução. Exige pesos inteiros.
+    """
+    num_itens = len(pesos)
+    melhor = np.zeros(capacidade + 1, dtype=valores.dtype)
+    escolhas = np.zeros((num_itens, -(-(capacidade + 1) // 8)), dtype=np.uint8)
+    for i in range(num_itens):
+        peso = int(pesos[i])
+        if peso > capacidade:
+            continue
+        candidato = melhor[:capacidade + 1 - peso] + valores[i]
+        pega = candidato > melhor[peso:]
+        melhor[peso:] = np.where(pega, candidato, melhor[peso:])
+        escolhas[i] = np.packbits(np.concatenate([np.zeros(peso, dtype=bool), pega]), bitorder='little')
+    
+    solucao = [0] * num_itens
+    restante = capacidade
+    for i in reversed(range(num_itens)):
+        if escolhas[i, restante // 8] >> (restante % 8) & 1:
+            solucao[i] = 1
+            restante -= int(pesos[i])
+    return melhor[capacidade].item(), solucao
+
+def resolver_branch_and_bound(pesos, valores, capacidade, limite_nos=None):
+    """
+    Busca em profundidade sobre os itens em ordem de valor/peso, podando
+    ramos cujo limite da relaxação linear não supera a melhor solução já
+    achada. O limite de cada nó sai de somas prefixadas e uma busca binária.
+    Com `limite_nos`, para depois de tantos nós e devolve a melhor solução
+    até ali (que pode não ser ótima).
+    Retorna (valor, solução, provado_otimo).
+    """
+    import bisect
+    
+    num_itens = len(pesos)
+    ordem = sorted(range(num_itens), key=lambda i: valores[i] / pesos[i] if pesos[i] else float('inf'),
+                   reverse=True)
+    peso_ordenado = [pesos[i] for i in ordem]
+    valor_ordenado = [valores[i] for i in ordem]
+    peso_acumulado = [0]
+    valor_acumulado = [0]
+    for peso, valor in zip(peso_ordenado, valor_ordenado):
+        peso_acumulado.append(peso_acumulado[-1] + peso)
+        valor_acumulado.append(valor_acumulado[-1] + valor)
+    
+    def limite(k, peso_atual, valor_atual):
+        # itens k..j-1 cabem inteiros; o item j entra fracionado
+        j = bisect.bisect_right(peso_acumulado, peso_acumulado[k] + capacidade - peso_atual) - 1
+        valor = valor_atual + valor_acumulado[j] - valor_acumulado[k]
+        if j < num_itens:
+            folga = capacidade - peso_atual - (peso_acumulado[j] - peso_acumulado[k])
+            valor += valor_ordenado[j] * folga / peso_ordenado[j]
+        return valor
+    
+    melhor_valor, melhor_caminho = 0, None
+    # cada nó: (próximo item, peso, valor, itens escolhidos como lista encadeada)
+    pilha = [(0, 0, 0, None)]
+    nos = 0
+    interrompido = False
+    while pilha:
+        if limite_nos is not None and nos >= limite_nos:
+            interrompido = True  # o próximo nó ficaria sem ser explorado
+            break
+        k, peso_atual, valor_atual, caminho = pilha.pop()
+        nos += 1
+        if valor_atual > melhor_valor:
+            melhor_valor, melhor_caminho = valor_atual, caminho
+        if k == num_itens or limite(k, peso_atual, valor_atual) <= melhor_valor:
+            continue
+        pilha.append((k + 1, peso_atual, valor_atual, caminho))
+        if peso_atual + peso_ordenado[k] <= capacidade:
+            # empilhado por último: o ramo que inclui o item é explorado primeiro
+            pilha.append((k + 1, peso_atual + peso_ordenado[k], valor_atual + valor_ordenado[k], (k, caminho)))
+    
+    solucao = [0] * num_itens
+    while melhor_caminho is not None:
+        k, melhor_caminho = melhor_caminho
+        solucao[ordem[k]] = 1
+    return melhor_valor, solucao, not interrompido
+
+def resolver_exato(itens, capacidade, limite_celulas=2 * 10**8, limite_nos=None):
+    """
+    Ótimo da instância: programação dinâmica quando os pesos são inteiros e
+    a tabela (itens x capacidade) tem até `limite_celulas` posições,
+    branch and bound nos demais casos.
+    Retorna (valor, solução, método, provado_otimo).
+    """
+    pesos = np.array([peso for peso, _ in itens])
+    valores = np.array([valor for _, valor in itens])
+    pesos_inteiros = np.all(pesos == np.round(pesos)) and np.all(pesos >= 0)
+    if pesos_inteiros and len(itens) * (capacidade + 1) <= limite_celulas:
+        valor, solucao = resolver_programacao_dinamica(pesos, valores, int(capacidade))
+        return valor, solucao, 'programacao_dinamica', True
+    valor, solucao, provado = resolver_branch_and_bound(pesos.tolist(), valores.tolist(), capacidade, limite_nos)
+    return valor, solucao, 'branch_and_bound', provado
+
+# Histórico e Progresso
+class HistoricoEvolucao:
+    """
+    Histórico de uma execução em arrays NumPy pré-alocados para `geracoes`
+    gerações (crescem se preciso): melhor fitness, média, peso da melhor
+    solução, avaliações por segundo e tempo de parede de cada geração.
+    Continua se comportando como a antiga lista de tuplas (melhor, média):
+    len(h), h[0], h[-1][1] e iteração funcionam como antes.
+    """
+    COLUNAS = ('melhor', 'media', 'peso', 'avaliacoes_por_segundo', 'tempo')
+
+    def __init__(self, geracoes, itens=()):
+        tipo_valor = np.array([valor for _, valor in itens]).dtype if len(itens) else np.float64
+        tipo_peso = np.array([peso for peso, _ in itens]).dtype if len(itens) else np.float64
+        self.melhor = np.zeros(geracoes, dtype=tipo_valor)
+        self.media = np.zeros(geracoes)
+        self.peso = np.zeros(geracoes, dtype=tipo_peso)
+        self.avaliacoes_por_segundo = np.zeros(geracoes)
+        self.tempo = np.zeros(geracoes)
+        self.tamanho = 0
+        self.ultimo_registro = time.perf_counter()
+
+    def registrar(self, melhor, media, peso, avaliacoes, tempo=None):
+        """
+        Acrescenta uma geração. Sem `tempo`, usa o tempo decorrido desde o
+        registro anterior (ou desde a criação do histórico).
+        """
+        agora = time.perf_counter()
+        if tempo is None:
+            tempo = agora - self.ultimo_registro
+        self.ultimo_registro = agora
+        
+        if self.tamanho == len(self.melhor):
+            for coluna in self.COLUNAS:
+                array = getattr(self, coluna)
+                setattr(self, coluna, np.concatenate([array, np.zeros(max(len(array), 1), dtype=array.dtype)]))
+        i = self.tamanho
+        self.melhor[i], self.media[i], self.peso[i] = melhor, media, peso
+        self.avaliacoes_por_segundo[i] = avaliacoes / tempo if tempo > 0 else np.inf
+        self.tempo[i] = tempo
+        self.tamanho += 1
+
+    def __len__(self):
+        return self.tamanho
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self.tamanho))]
+        if indice < 0:
+            indice += self.tamanho
+        if not 0 <= indice < self.tamanho:
+            raise IndexError("índice fora do histórico")
+        return self.melhor[indice].item(), self.media[indice].item()
+
+    def __iter__(self):
+        return (self[i] for i in range(self.tamanho))
+
+    def para_dataframe(self):
+        dados = {coluna: getattr(self, coluna)[:self.tamanho] for coluna in self.COLUNAS}
+        return pd.DataFrame(dados).rename_axis('geracao').reset_index()
+
+    def exportar(self, caminho):
+        """
+        Grava o histórico em CSV ou, se o caminho terminar em .parquet, em
+        Parquet (pandas precisa de pyarrow ou fastparquet para isso)
+        """
+        df = self.para_dataframe()
+        if caminho.endswith('.parquet'):
+            df.to_parquet(caminho, index=False)
+        else:
+            df.to_csv(caminho, index=False)
+
+def imprimir_progresso(geracao, historico):
+    """
+    Callback de progresso padrão: uma linha da tabela de evolução
+    """
+    print(f"{geracao:6} | {historico.melhor[geracao].item():14} | {historico.peso[geracao].item():4} | "
+          f"{historico.media[geracao]:12.2f}")
+
+class RelatorioProgresso:
+    """
+    O que uma execução do AG escreve, segundo as chaves de `config`:
+      - 'silencioso': não imprime nada (configurações, progresso, mensagens
+        de parada e resultado)
+      - 'progresso': função progresso(geracao, historico) chamada nas gerações
+        amostradas; por padrão imprimir_progresso (desligado no modo silencioso)
+      - 'progresso_a_cada': amostra uma geração a cada N (padrão 1; 0 desliga)
+      - 'progresso_a_cada_segundos': em vez disso, no máximo uma geração a
+        cada T segundos
+    A geração 0 é sempre relatada.
+    """
+    def __init__(self, config):
+        self.silencioso = config.get('silencioso', False)
+        self.progresso = config.get('progresso') or (None if self.silencioso else imprimir_progresso)
+        self.a_cada = config.get('progresso_a_cada', 1)
+        self.a_cada_segundos = config.get('progresso_a_cada_segundos')
+        self.ultimo_relato = None
+
+    def configuracoes(self, config, alvo=None):
+        if not self.silencioso:
+            imprimir_configuracoes(config, alvo)
+
+    def geracao(self, geracao, historico):
+        if self.progresso is None:
+            return
+        if self.a_cada_segundos is not None:
+            agora = time.perf_counter()
+            if self.ultimo_relato is not None and agora - self.ultimo_relato < self.a_cada_segundos:
+                return
+            self.ultimo_relato = agora
+        elif self.a_cada < 1 or geracao % self.a_cada:
+            return
+        self.progresso(geracao, historico)
+
+    def mensagem(self, texto):
+        if not self.silencioso:
+            print(texto)
+
+    def resultado(self, melhor_solucao, melhor_fitness, melhor_peso, capacidade, avaliador=None):
+        if self.silencioso:
+            return
+        imprimir_resultado(melhor_solucao, melhor_fitness, melhor_peso, capacidade)
+        if avaliador:
+            avaliador.imprimir_estatisticas()
+
 def algoritmo_genetico(itens, capacidade, config):
     num_itens = len(itens)
     
@@ -124,6 +520,13 @@ def algoritmo_genetico(itens, capacidade, config):
     inicializacao = config.get('inicializacao', 'aleatoria')
     criterio_parada = config.get('criterio_parada', 'geracoes')
     limite_convergencia = config.get('limite_convergencia', 20)
+    alvo = valor_alvo(itens, capacidade, config)
+    selecao_em_lote = config.get('selecao_em_lote', False)
+    rng = np.random.default_rng(random.getrandbits(64)) if selecao_em_lote else None
+    tamanho_cache = config.get('cache_fitness', 0)
+    avaliacao_incremental = config.get('avaliacao_incremental', False)
+    avaliador = (AvaliadorFitness(itens, capacidade, tamanho_cache)
+                 if tamanho_cache or avaliacao_incremental else None)
     
     # Inicialização da população
     if inicializacao == 'aleatoria':
@@ -131,63 +534,72 @@ def algoritmo_genetico(itens, capacidade, config):
     else:
         populacao = inicializar_populacao_heuristica(tamanho_populacao, itens, capacidade)
     
-    historico_fitness = []
+    relatorio = RelatorioProgresso(config)
+    historico_fitness = HistoricoEvolucao(geracoes, itens)
     melhor_solucao = None
     melhor_fitness = -1
     melhor_peso = 0
     contador_convergencia = 0
+    # (valor, peso) herdados por delta para cada indivíduo da população (ou None)
+    brutos = [None] * len(populacao)
     
-    print("\nConfigurações utilizadas:")
-    print(f" - Tamanho da população: {tamanho_populacao}")
-    print(f" - Taxa de crossover: {taxa_crossover}")
-    print(f" - Taxa de mutação: {taxa_mutacao}")
-    print(f" - Método de seleção: {metodo_selecao}")
-    print(f" - Método de crossover: {metodo_crossover}")
-    print(f" - Método de mutação: {metodo_mutacao}")
-    print(f" - Inicialização: {inicializacao}")
-    print(f" - Critério de parada: {criterio_parada}")
-    if criterio_parada == 'convergencia':
-        print(f" - Limite de convergência: {limite_convergencia} gerações sem melhora")
-    
-    print("\nEvolução do fitness por geração:")
-    print("Geração | Melhor Fitness | Peso | Média Fitness")
-    print("-----------------------------------------------")
+    relatorio.configuracoes(config, alvo)
     
     for geracao in range(geracoes):
-        fitness_populacao = [calcular_fitness(ind, itens, capacidade) for ind in populacao]
+        if avaliador:
+            brutos = [avaliador.avaliar(ind, bruto) for ind, bruto in zip(populacao, brutos)]
+            fitness_populacao = [avaliador.fitness(bruto) for bruto in brutos]
+        else:
+            fitness_populacao = [calcular_fitness(ind, itens, capacidade) for ind in populacao]
         media_fitness = sum(f[0] for f in fitness_populacao) / len(fitness_populacao)
         
         # Encontrar a melhor solução atual
         melhor_atual = max(fitness_populacao, key=lambda x: x[0])
         if melhor_atual[0] > melhor_fitness:
             melhor_fitness, melhor_peso = melhor_atual
-            melhor_solucao = populacao[fitness_populacao.index(melhor_atual)]
+            indice_melhor = fitness_populacao.index(melhor_atual)
+            melhor_solucao = populacao[indice_melhor]
+            melhor_bruto = brutos[indice_melhor]
             contador_convergencia = 0
         else:
             contador_convergencia += 1
         
         # Registrar histórico
-        historico_fitness.append((melhor_fitness, media_fitness))
+        historico_fitness.registrar(melhor_fitness, media_fitness, melhor_peso, len(populacao))
         
         # Mostrar progresso
-        print(f"{geracao:6} | {melhor_fitness:14} | {melhor_peso:4} | {media_fitness:12.2f}")
+        relatorio.geracao(geracao, historico_fitness)
         
         # Verificar critério de parada por convergência
         if criterio_parada == 'convergencia' and contador_convergencia >= limite_convergencia:
-            print(f"\nConvergência atingida após {geracao} gerações sem melhora.")
+            relatorio.mensagem(f"\nConvergência atingida após {geracao} gerações sem melhora.")
+            break
+        if alvo is not None and melhor_fitness >= alvo:
+            relatorio.mensagem(f"\nValor alvo {alvo} atingido na geração {geracao}.")
             break
         
         # Nova população
+        if selecao_em_lote:
+            selecionar_em_lote = (selecionar_roleta_em_lote if metodo_selecao == 'roleta'
+                                  else selecionar_torneio_em_lote)
+            pares = selecionar_em_lote(fitness_populacao, tamanho_populacao // 2, rng)
+        if avaliacao_incremental:
+            bruto_de = {id(ind): bruto for ind, bruto in zip(populacao, brutos)}
+        
         nova_populacao = []
-        for _ in range(tamanho_populacao // 2):
+        novos_brutos = []
+        for par in range(tamanho_populacao // 2):
             # Seleção
-            if metodo_selecao == 'roleta':
+            if selecao_em_lote:
+                pai, mae = populacao[pares[par, 0]], populacao[pares[par, 1]]
+            elif metodo_selecao == 'roleta':
                 pai, mae = selecionar_roleta(populacao, fitness_populacao)
             else:
                 pai, mae = selecionar_torneio(populacao, fitness_populacao)
             
             # Crossover
-            if random.random() < taxa_crossover:
+            cruzou = random.random() < taxa_crossover
+            if cruzou:
                 if metodo_crossover == 'um_ponto':
                     filho1, filho2 = cruzar_um_ponto(pai, mae)
                 elif metodo_crossover == 'dois_pontos':
@@ -198,7 +610,17 @@ def algoritmo_genetico(itens, capacidade, config):
                 filho1, filho2 = pai.copy(), mae.copy()
             
             # Mutação
-            if metodo_mutacao == 'binaria':
+            if avaliacao_incremental:
+                mutar = mutar_binaria_rastreada if metodo_mutacao == 'binaria' else mutar_troca_rastreada
+                filho1, posicoes1 = mutar(filho1, taxa_mutacao)
+                filho2, posicoes2 = mutar(filho2, taxa_mutacao)
+                # sem crossover cada filho é o pai mais as posições mutadas
+                if cruzou:
+                    novos_brutos.extend([None, None])
+                else:
+                    novos_brutos.append(avaliador.delta(bruto_de[id(pai)], pai, filho1, posicoes1))
+                    novos_brutos.append(avaliador.delta(bruto_de[id(mae)], mae, filho2, posicoes2))
+            elif metodo_mutacao == 'binaria':
                 filho1 = mutar_binaria(filho1, taxa_mutacao)
                 filho2 = mutar_binaria(filho2, taxa_mutacao)
             else:
@@ -212,59 +634,597 @@ def algoritmo_genetico(itens, capacidade, config):
             nova_populacao[0] = melhor_solucao
         
         populacao = nova_populacao
+        brutos = novos_brutos or [None] * len(populacao)
+        if avaliacao_incremental and melhor_solucao:
+            brutos[0] = melhor_bruto
+    
+    relatorio.resultado(melhor_solucao, melhor_fitness, melhor_peso, capacidade, avaliador)
+    return melhor_solucao, historico_fitness
+
+def imprimir_configuracoes(config, alvo=None):
+    criterio_parada = config.get('criterio_parada', 'geracoes')
+    print("\nConfigurações utilizadas:")
+    print(f" - Tamanho da população: {config.get('tamanho_populacao', 50)}")
+    print(f" - Taxa de crossover: {config.get('taxa_crossover', 0.8)}")
+    print(f" - Taxa de mutação: {config.get('taxa_mutacao', 0.1)}")
+    print(f" - Método de seleção: {config.get('metodo_selecao', 'roleta')}"
+          f"{' (em lote)' if config.get('selecao_em_lote') else ''}")
+    print(f" - Método de crossover: {config.get('metodo_crossover', 'um_ponto')}")
+    print(f" - Método de mutação: {config.get('metodo_mutacao', 'binaria')}")
+    print(f" - Inicialização: {config.get('inicializacao', 'aleatoria')}")
+    if 'representacao' in config:
+        print(f" - Representação: {config['representacao']}")
+    if config.get('cache_fitness'):
+        print(f" - Cache de fitness: {config['cache_fitness']} cromossomos")
+    if config.get('avaliacao_incremental'):
+        print(" - Avaliação incremental: sim")
+    if 'ilhas' in config:
+        print(f" - Ilhas: {config['ilhas']} (migração de {config.get('migrantes', 2)} indivíduos a cada "
+              f"{config.get('intervalo_migracao', 10)} gerações, topologia {config.get('topologia', 'anel')})")
+    print(f" - Critério de parada: {criterio_parada}")
+    if criterio_parada == 'convergencia':
+        print(f" - Limite de convergência: {config.get('limite_convergencia', 20)} gerações sem melhora")
+    if alvo is not None:
+        print(f" - Valor alvo: {alvo}")
     
-    # Resultado final
+    print("\nEvolução do fitness por geração:")
+    print("Geração | Melhor Fitness | Peso | Média Fitness")
+    print("-----------------------------------------------")
+
+def imprimir_resultado(melhor_solucao, melhor_fitness, melhor_peso, capacidade):
     print("\nMelhor solução encontrada:")
     print(f"Valor total: {melhor_fitness}")
     print(f"Peso total: {melhor_peso}")
     print(f"Capacidade: {capacidade}")
-    print(f"Itens selecionados: {[i for i in range(num_itens) if melhor_solucao[i] == 1]}")
+    print(f"Itens selecionados: {[i for i in range(len(melhor_solucao)) if melhor_solucao[i] == 1]}")
+
+# Motor vetorizado: a população é uma matriz (indivíduos x itens) de uint8
+def calcular_fitness_populacao(populacao, pesos, valores, capacidade):
+    """
+    Fitness da população inteira com dois produtos matriz-vetor
+    """
+    peso_total = populacao @ pesos
+    valor_total = populacao @ valores
+    excede = peso_total > capacidade
+    return np.where(excede, 0, valor_total), np.where(excede, 0, peso_total)
+
+def inicializar_populacao_aleatoria_vetorizada(tamanho_populacao, num_itens, rng):
+    return rng.integers(0, 2, (tamanho_populacao, num_itens), dtype=np.uint8)
+
+def inicializar_populacao_heuristica_vetorizada(tamanho_populacao, pesos, valores, capacidade, rng):
+    """
+    Mesma heurística gulosa de inicializar_populacao_heuristica, percorrendo
+    os itens em ordem e decidindo para todos os indivíduos de uma vez
+    """
+    num_itens = len(pesos)
+    populacao = np.zeros((tamanho_populacao, num_itens), dtype=np.uint8)
+    peso_atual = np.zeros(tamanho_populacao, dtype=pesos.dtype)
+    
+    # Ordena itens por valor/peso (heurística gulosa)
+    for i in np.argsort(-(valores / pesos), kind='stable'):
+        adicionar = (peso_atual + pesos[i] <= capacidade) & (rng.random(tamanho_populacao) > 0.3)
+        populacao[adicionar, i] = 1
+        peso_atual[adicionar] += pesos[i]
+    
+    # Adiciona alguns itens aleatórios para diversidade
+    linhas = np.arange(tamanho_populacao)
+    for _ in range(int(num_itens * 0.1)):
+        idx = rng.integers(0, num_itens, tamanho_populacao)
+        adicionar = (populacao[linhas, idx] == 0) & (peso_atual + pesos[idx] <= capacidade)
+        populacao[linhas[adicionar], idx[adicionar]] = 1
+        peso_atual[adicionar] += pesos[idx[adicionar]]
+    
+    return populacao
+
+def cruzar_populacao(pais, maes, metodo_crossover, taxa_crossover, rng):
+    """
+    Crossover de todos os pares com uma máscara (pares x itens): onde ela é
+    verdadeira, filho1 herda da mãe e filho2 do pai. Pares sorteados para
+    não cruzar recebem máscara vazia (cópia dos pais).
+    """
+    num_pares, num_itens = pais.shape
+    posicoes = np.arange(num_itens)
+    if metodo_crossover == 'um_ponto':
+        ponto_corte = rng.integers(1, num_itens, num_pares)
+        mascara = posicoes >= ponto_corte[:, None]
+    elif metodo_crossover == 'dois_pontos':
+        ponto1 = rng.integers(1, num_itens - 1, num_pares)
+        ponto2 = rng.integers(ponto1, num_itens)
+        mascara = (posicoes >= ponto1[:, None]) & (posicoes < ponto2[:, None])
+    else:
+        mascara = rng.random((num_pares, num_itens)) < 0.5
+    mascara &= (rng.random(num_pares) < taxa_crossover)[:, None]
+    return np.where(mascara, maes, pais), np.where(mascara, pais, maes)
+
+def mutar_binaria_populacao(populacao, taxa_mutacao, rng):
+    return populacao ^ (rng.random(populacao.shape) < taxa_mutacao)
+
+def mutar_troca_populacao(populacao, taxa_mutacao, rng):
+    """
+    Troca cada gene sorteado com outro aleatório do mesmo indivíduo, na ordem
+    dos genes como em mutar_troca. A k-ésima troca de todos os indivíduos é
+    feita numa mesma operação, então o laço roda só tantas vezes quanto o
+    maior número de trocas de um indivíduo.
+    """
+    populacao = populacao.copy()
+    linhas, colunas = np.nonzero(rng.random(populacao.shape) < taxa_mutacao)
+    parceiros = rng.integers(0, populacao.shape[1], len(linhas))
+    # posição de cada troca dentro do seu indivíduo (nonzero percorre linha a linha)
+    ordem_na_linha = np.arange(len(linhas)) - np.searchsorted(linhas, linhas)
+    por_rodada = np.argsort(ordem_na_linha, kind='stable')
+    limites = np.cumsum(np.bincount(ordem_na_linha, minlength=1))
+    for inicio, fim in zip(np.concatenate([[0], limites[:-1]]), limites):
+        troca = por_rodada[inicio:fim]
+        l, i, j = linhas[troca], colunas[troca], parceiros[troca]
+        populacao[l, i], populacao[l, j] = populacao[l, j], populacao[l, i]
+    return populacao
+
+# Representação em bits: cada indivíduo é uma linha de bytes (np.packbits,
+# bitorder='little'), o item i é o bit i % 8 do byte i // 8 e os bits que
+# sobram no último byte ficam sempre em zero
+def compactar_populacao(populacao):
+    return np.packbits(populacao, axis=1, bitorder='little')
+
+def descompactar_populacao(populacao, num_itens):
+    return np.unpackbits(populacao, axis=1, count=num_itens, bitorder='little')
+
+def tabela_de_somas(quantidades):
+    """
+    Tabela (bytes x 256): para cada byte do cromossomo e cada valor que ele
+    pode assumir, a soma das quantidades dos itens cujos bits estão ligados
+    """
+    num_bytes = -(-len(quantidades) // 8)
+    por_byte = np.zeros(num_bytes * 8, dtype=quantidades.dtype)
+    por_byte[:len(quantidades)] = quantidades
+    bits = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1, bitorder='little')
+    return por_byte.reshape(num_bytes, 8) @ bits.T
+
+def calcular_fitness_compactada(populacao, tabela_pesos, tabela_valores, capacidade, bloco=64):
+    """
+    Soma pesos e valores consultando a tabela de cada byte, em blocos de
+    indivíduos para não materializar uma matriz (indivíduos x bytes) inteira
+    """
+    colunas = np.arange(populacao.shape[1])
+    peso_total = np.empty(len(populacao), dtype=tabela_pesos.dtype)
+    valor_total = np.empty(len(populacao), dtype=tabela_valores.dtype)
+    for inicio in range(0, len(populacao), bloco):
+        parte = populacao[inicio:inicio + bloco]
+        peso_total[inicio:inicio + bloco] = tabela_pesos[colunas, parte].sum(axis=1)
+        valor_total[inicio:inicio + bloco] = tabela_valores[colunas, parte].sum(axis=1)
+    excede = peso_total > capacidade
+    return np.where(excede, 0, valor_total), np.where(excede, 0, peso_total)
+
+def inicializar_populacao_compactada(tamanho_populacao, num_itens, rng):
+    populacao = rng.integers(0, 256, (tamanho_populacao, -(-num_itens // 8)), dtype=np.uint8)
+    if num_itens % 8:
+        populacao[:, -1] &= (1 << (num_itens % 8)) - 1
+    return populacao
+
+def mascara_de_corte(pontos, num_bytes):
+    """
+    Máscara compactada com os bits de posição >= ponto ligados, um ponto por linha
+    """
+    posicoes = np.arange(num_bytes)
+    byte_corte, bit_corte = pontos[:, None] // 8, pontos[:, None] % 8
+    parcial = (0xFF << bit_corte) & 0xFF
+    return np.where(posicoes > byte_corte, 0xFF, np.where(posicoes == byte_corte, parcial, 0)).astype(np.uint8)
+
+def cruzar_populacao_compactada(pais, maes, metodo_crossover, taxa_crossover, num_itens, rng):
+    """
+    Mesmos cortes de cruzar_populacao, com a troca feita por XOR/AND sobre
+    bytes inteiros: filhos = pais ^ ((pais ^ mães) & máscara)
+    """
+    num_pares, num_bytes = pais.shape
+    if metodo_crossover == 'um_ponto':
+        mascara = mascara_de_corte(rng.integers(1, num_itens, num_pares), num_bytes)
+    elif metodo_crossover == 'dois_pontos':
+        ponto1 = rng.integers(1, num_itens - 1, num_pares)
+        ponto2 = rng.integers(ponto1, num_itens)
+        mascara = mascara_de_corte(ponto1, num_bytes) & ~mascara_de_corte(ponto2, num_bytes)
+    else:
+        mascara = rng.integers(0, 256, (num_pares, num_bytes), dtype=np.uint8)
+    mascara[rng.random(num_pares) >= taxa_crossover] = 0
+    diferenca = (pais ^ maes) & mascara
+    return pais ^ diferenca, maes ^ diferenca
+
+def mutar_binaria_compactada(populacao, taxa_mutacao, num_itens, rng):
+    """
+    Com taxa baixa sorteia só as posições que mudam e inverte cada bit com
+    bitwise_xor.at; com taxa alta é mais barato compactar uma máscara densa
+    """
+    if taxa_mutacao > 0.05:
+        return populacao ^ compactar_populacao(rng.random((len(populacao), num_itens)) < taxa_mutacao)
+    populacao = populacao.copy()
+    total = len(populacao) * num_itens
+    posicoes = np.unique(rng.integers(0, total, rng.binomial(total, taxa_mutacao)))
+    linhas, itens = np.divmod(posicoes, num_itens)
+    np.bitwise_xor.at(populacao, (linhas, itens // 8), (1 << (itens % 8)).astype(np.uint8))
+    return populacao
+
+class MotorVetorizado:
+    """
+    Operadores de uma população em matriz para uma instância e uma config:
+    inicialização, avaliação e reprodução (seleção, crossover e mutação) de
+    uma geração inteira. Usado por algoritmo_genetico_vetorizado e por cada
+    ilha de algoritmo_genetico_ilhas.
+    """
+    def __init__(self, itens, capacidade, config, rng):
+        self.capacidade = capacidade
+        self.config = config
+        self.rng = rng
+        self.pesos = np.array([peso for peso, _ in itens])
+        self.valores = np.array([valor for _, valor in itens])
+        self.num_itens = len(itens)
+        self.compactada = config.get('representacao', 'matriz') == 'bits'
+        if self.compactada:
+            self.tabela_pesos = tabela_de_somas(self.pesos)
+            self.tabela_valores = tabela_de_somas(self.valores)
+
+    def inicializar(self):
+        tamanho_populacao = self.config.get('tamanho_populacao', 50)
+        if self.config.get('inicializacao', 'aleatoria') == 'aleatoria':
+            if self.compactada:
+                return inicializar_populacao_compactada(tamanho_populacao, self.num_itens, self.rng)
+            return inicializar_populacao_aleatoria_vetorizada(tamanho_populacao, self.num_itens, self.rng)
+        
+        populacao = inicializar_populacao_heuristica_vetorizada(tamanho_populacao, self.pesos, self.valores,
+                                                                self.capacidade, self.rng)
+        return compactar_populacao(populacao) if self.compactada else populacao
+
+    def avaliar(self, populacao):
+        if self.compactada:
+            return calcular_fitness_compactada(populacao, self.tabela_pesos, self.tabela_valores,
+                                               self.capacidade)
+        return calcular_fitness_populacao(populacao, self.pesos, self.valores, self.capacidade)
+
+    def reproduzir(self, populacao, fitness):
+        """
+        Próxima geração (sem o elitismo, que fica com quem chama)
+        """
+        config, rng, num_itens = self.config, self.rng, self.num_itens
+        taxa_mutacao = config.get('taxa_mutacao', 0.1)
+        taxa_crossover = config.get('taxa_crossover', 0.8)
+        metodo_crossover = config.get('metodo_crossover', 'um_ponto')
+        metodo_mutacao = config.get('metodo_mutacao', 'binaria')
+        
+        num_pares = config.get('tamanho_populacao', 50) // 2
+        if config.get('metodo_selecao', 'roleta') == 'roleta':
+            pares = selecionar_roleta_em_lote(fitness, num_pares, rng)
+        else:
+            pares = selecionar_torneio_em_lote(fitness, num_pares, rng)
+        
+        if self.compactada:
+            filhos1, filhos2 = cruzar_populacao_compactada(populacao[pares[:, 0]], populacao[pares[:, 1]],
+                                                           metodo_crossover, taxa_crossover, num_itens, rng)
+        else:
+            filhos1, filhos2 = cruzar_populacao(populacao[pares[:, 0]], populacao[pares[:, 1]],
+                                                metodo_crossover, taxa_crossover, rng)
+        # intercala os filhos de cada par, como nova_populacao.extend([filho1, filho2])
+        nova_populacao = np.stack([filhos1, filhos2], axis=1).reshape(-1, populacao.shape[1])
+        
+        if metodo_mutacao == 'binaria' and self.compactada:
+            return mutar_binaria_compactada(nova_populacao, taxa_mutacao, num_itens, rng)
+        if metodo_mutacao == 'binaria':
+            return mutar_binaria_populacao(nova_populacao, taxa_mutacao, rng)
+        if self.compactada:
+            return compactar_populacao(mutar_troca_populacao(
+                descompactar_populacao(nova_populacao, num_itens), taxa_mutacao, rng))
+        return mutar_troca_populacao(nova_populacao, taxa_mutacao, rng)
+
+    def como_lista(self, individuo):
+        if self.compactada:
+            individuo = descompactar_populacao(individuo[None, :], self.num_itens)[0]
+        return individuo.tolist()
+
+def algoritmo_genetico_vetorizado(itens, capacidade, config):
+    """
+    Mesmo algoritmo e mesmas chaves de `config` de algoritmo_genetico, com a
+    população numa matriz NumPy: fitness, seleção, crossover e mutação são
+    feitos para a geração inteira em operações sobre arrays. Os números
+    aleatórios vêm de um Generator semeado pelo módulo random, então
+    random.seed() também torna este motor reprodutível.
+    Com config['representacao'] = 'bits' cada gene ocupa um bit em vez de
+    um byte (ver compactar_populacao); a mutação por troca e a inicialização
+    heurística passam pela matriz descompactada.
+    """
+    motor = MotorVetorizado(itens, capacidade, config, np.random.default_rng(random.getrandbits(64)))
+    
+    # Configurações do algoritmo
+    geracoes = config.get('geracoes', 100)
+    criterio_parada = config.get('criterio_parada', 'geracoes')
+    limite_convergencia = config.get('limite_convergencia', 20)
+    alvo = valor_alvo(itens, capacidade, config)
+    
+    populacao = motor.inicializar()
+    
+    relatorio = RelatorioProgresso(config)
+    historico_fitness = HistoricoEvolucao(geracoes, itens)
+    melhor_solucao = None
+    melhor_fitness = -1
+    melhor_peso = 0
+    contador_convergencia = 0
+    
+    relatorio.configuracoes(config, alvo)
+    
+    for geracao in range(geracoes):
+        fitness, peso = motor.avaliar(populacao)
+        media_fitness = fitness.mean()
+        
+        # Encontrar a melhor solução atual
+        indice_melhor = np.argmax(fitness)
+        if fitness[indice_melhor] > melhor_fitness:
+            melhor_fitness, melhor_peso = fitness[indice_melhor].item(), peso[indice_melhor].item()
+            melhor_solucao = populacao[indice_melhor].copy()
+            contador_convergencia = 0
+        else:
+            contador_convergencia += 1
+        
+        # Registrar histórico
+        historico_fitness.registrar(melhor_fitness, media_fitness, melhor_peso, len(populacao))
+        
+        # Mostrar progresso
+        relatorio.geracao(geracao, historico_fitness)
+        
+        # Verificar critério de parada por convergência
+        if criterio_parada == 'convergencia' and contador_convergencia >= limite_convergencia:
+            relatorio.mensagem(f"\nConvergência atingida após {geracao} gerações sem melhora.")
+            break
+        if alvo is not None and melhor_fitness >= alvo:
+            relatorio.mensagem(f"\nValor alvo {alvo} atingido na geração {geracao}.")
+            break
+        
+        nova_populacao = motor.reproduzir(populacao, fitness)
+        
+        # Elitismo: manter a melhor solução
+        if melhor_solucao is not None:
+            nova_populacao[0] = melhor_solucao
+        
+        populacao = nova_populacao
     
+    melhor_solucao = motor.como_lista(melhor_solucao)
+    relatorio.resultado(melhor_solucao, melhor_fitness, melhor_peso, capacidade)
     return melhor_solucao, historico_fitness
 
-def testar_configuracoes(itens, capacidade):
-    configuracoes = [
-        # Testes de crossover
-        {'metodo_crossover': 'um_ponto', 'descricao': "Crossover - Um Ponto"},
-        {'metodo_crossover': 'dois_pontos', 'descricao': "Crossover - Dois Pontos"},
-        {'metodo_crossover': 'uniforme', 'descricao': "Crossover - Uniforme"},
+# Modelo de Ilhas
+def _executar_ilha(conexao, itens, capacidade, config, semente):
+    """
+    Processo de uma ilha. Evolui a própria população com MotorVetorizado em
+    épocas conversando com o processo principal: recebe o número de gerações
+    da época (None encerra), devolve o histórico da época, a melhor solução
+    e os emigrantes (os melhores da população) e recebe os imigrantes, que
+    substituem os piores indivíduos.
+    """
+    motor = MotorVetorizado(itens, capacidade, config, np.random.default_rng(semente))
+    num_migrantes = config.get('migrantes', 2)
+    populacao = motor.inicializar()
+    melhor_solucao = None
+    melhor_fitness = -1
+    melhor_peso = 0
+    
+    while (geracoes := conexao.recv()) is not None:
+        historico = []
+        for _ in range(geracoes):
+            fitness, peso = motor.avaliar(populacao)
+            indice_melhor = np.argmax(fitness)
+            if fitness[indice_melhor] > melhor_fitness:
+                melhor_fitness, melhor_peso = fitness[indice_melhor].item(), peso[indice_melhor].item()
+                melhor_solucao = populacao[indice_melhor].copy()
+            historico.append((melhor_fitness, melhor_peso, fitness.mean().item()))
+            
+            populacao = motor.reproduzir(populacao, fitness)
+            populacao[0] = melhor_solucao
         
-        # Testes de mutação
-        {'metodo_mutacao': 'binaria', 'taxa_mutacao': 0.01, 'descricao': "Mutação - Baixa (1%)"},
-        {'metodo_mutacao': 'binaria', 'taxa_mutacao': 0.1, 'descricao': "Mutação - Média (10%)"},
-        {'metodo_mutacao': 'binaria', 'taxa_mutacao': 0.3, 'descricao': "Mutação - Alta (30%)"},
+        fitness, _ = motor.avaliar(populacao)
+        ordem = np.argsort(-fitness, kind='stable')
+        conexao.send((historico, melhor_fitness, melhor_peso, motor.como_lista(melhor_solucao),
+                      populacao[ordem[:num_migrantes]]))
         
-        # Testes de inicialização
-        {'inicializacao': 'aleatoria', 'descricao': "Inicialização - Aleatória"},
-        {'inicializacao': 'heuristica', 'descricao': "Inicialização - Heurística"},
+        imigrantes = conexao.recv()[:len(populacao) - 1]
+        if len(imigrantes):
+            populacao[ordem[len(ordem) - len(imigrantes):]] = imigrantes
+
+def algoritmo_genetico_ilhas(itens, capacidade, config):
+    """
+    Modelo de ilhas: config['ilhas'] subpopulações (cada uma com as demais
+    chaves de `config`, inclusive tamanho_populacao) evoluem em processos
+    separados com o motor vetorizado. A cada config['intervalo_migracao']
+    gerações cada ilha envia seus config['migrantes'] melhores indivíduos
+    para a próxima do anel (config['topologia'] = 'anel') ou para outra ilha
+    sorteada ('aleatoria'), onde substituem os piores.
+    A migração é síncrona e cada ilha tem um Generator derivado de
+    config['semente'] (ou, sem ela, do módulo random), então a execução é
+    reprodutível. O histórico traz, por geração, o melhor fitness global e
+    a média das médias das ilhas; a convergência e o valor alvo são
+    verificados sobre ele, e as ilhas param ao fim da época.
+    """
+    import multiprocessing
+    
+    num_ilhas = config.get('ilhas', multiprocessing.cpu_count())
+    intervalo_migracao = config.get('intervalo_migracao', 10)
+    topologia = config.get('topologia', 'anel')
+    geracoes = config.get('geracoes', 100)
+    criterio_parada = config.get('criterio_parada', 'geracoes')
+    limite_convergencia = config.get('limite_convergencia', 20)
+    alvo = valor_alvo(itens, capacidade, config)
+    semente = config.get('semente')
+    if semente is None:  # só consome do gerador global quando não há semente
+        semente = random.getrandbits(64)
+    
+    sementes = np.random.SeedSequence(semente).spawn(num_ilhas + 1)
+    rng = np.random.default_rng(sementes[-1])  # sorteio dos destinos na topologia aleatória
+    
+    relatorio = RelatorioProgresso(config)
+    historico_fitness = HistoricoEvolucao(geracoes, itens)
+    melhor_solucao = None
+    melhor_fitness = -1
+    melhor_peso = 0
+    contador_convergencia = 0
+    avaliacoes_por_geracao = num_ilhas * config.get('tamanho_populacao', 50)
+    
+    relatorio.configuracoes({**config, 'ilhas': num_ilhas}, alvo)
+    
+    conexoes, processos = [], []
+    for ilha in range(num_ilhas):
+        conexao, conexao_ilha = multiprocessing.Pipe()
+        processo = multiprocessing.Process(target=_executar_ilha, daemon=True,
+                                           args=(conexao_ilha, itens, capacidade, config, sementes[ilha]))
+        processo.start()
+        conexoes.append(conexao)
+        processos.append(processo)
+    
+    try:
+        geracao = 0
+        parar = False
+        while geracao < geracoes and not parar:
+            epoca = min(intervalo_migracao, geracoes - geracao)
+            inicio_epoca = time.perf_counter()
+            for conexao in conexoes:
+                conexao.send(epoca)
+            respostas = [conexao.recv() for conexao in conexoes]
+            tempo_geracao = (time.perf_counter() - inicio_epoca) / epoca
+            
+            # Histórico global da época
+            for passo in range(epoca):
+                fitness_ilha, peso_ilha, _ = max((resposta[0][passo] for resposta in respostas),
+                                                 key=lambda x: x[0])
+                media_fitness = sum(resposta[0][passo][2] for resposta in respostas) / num_ilhas
+                if fitness_ilha > melhor_fitness:
+                    melhor_fitness, melhor_peso = fitness_ilha, peso_ilha
+                    contador_convergencia = 0
+                else:
+                    contador_convergencia += 1
+                historico_fitness.registrar(melhor_fitness, media_fitness, melhor_peso,
+                                            avaliacoes_por_geracao, tempo_geracao)
+                relatorio.geracao(geracao, historico_fitness)
+                
+                if not parar and criterio_parada == 'convergencia' and contador_convergencia >= limite_convergencia:
+                    relatorio.mensagem(f"\nConvergência atingida após {geracao} gerações sem melhora.")
+                    parar = True
+                elif not parar and alvo is not None and melhor_fitness >= alvo:
+                    relatorio.mensagem(f"\nValor alvo {alvo} atingido na geração {geracao}.")
+                    parar = True
+                geracao += 1
+            
+            # a melhor solução global é a melhor das ilhas ao fim da época
+            melhor_solucao = max(respostas, key=lambda resposta: resposta[1])[3]
+            
+            # Migração
+            emigrantes = [resposta[4] for resposta in respostas]
+            if topologia == 'anel':
+                destinos = [(ilha + 1) % num_ilhas for ilha in range(num_ilhas)]
+            else:
+                destinos = [(ilha + rng.integers(1, num_ilhas)) % num_ilhas if num_ilhas > 1 else ilha
+                            for ilha in range(num_ilhas)]
+            imigrantes = [[] for _ in range(num_ilhas)]
+            for origem, destino in enumerate(destinos):
+                if destino != origem:
+                    imigrantes[destino].append(emigrantes[origem])
+            for conexao, recebidos in zip(conexoes, imigrantes):
+                conexao.send(np.concatenate(recebidos) if recebidos else emigrantes[0][:0])
         
-        # Testes de critério de parada
-        {'criterio_parada': 'geracoes', 'descricao': "Parada - Gerações Fixas"},
-        {'criterio_parada': 'convergencia', 'limite_convergencia': 10, 'descricao': "Parada - Convergência (10 gerações)"},
-    ]
+        for conexao in conexoes:
+            conexao.send(None)
+        for processo in processos:
+            processo.join()
+    finally:
+        for processo in processos:
+            if processo.is_alive():
+                processo.terminate()
+    
+    relatorio.resultado(melhor_solucao, melhor_fitness, melhor_peso, capacidade)
+    return melhor_solucao, historico_fitness
+
+def comparar_representacoes(num_itens=20_000, tamanho_populacao=200, geracoes=5, semente=0):
+    """
+    Memória da população e gerações por segundo das três representações
+    (lista de ints, matriz de bytes e bits) numa instância aleatória
+    """
+    import tracemalloc
+    
+    gerador = random.Random(semente)
+    itens = [(gerador.randint(1, 100), gerador.randint(1, 100)) for _ in range(num_itens)]
+    capacidade = sum(peso for peso, _ in itens) // 2
+    config = {'tamanho_populacao': tamanho_populacao, 'geracoes': geracoes}
+    
+    tracemalloc.start()
+    inicializar_populacao_aleatoria(tamanho_populacao, num_itens)
+    memoria_lista = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    num_bytes = -(-num_itens // 8)
+    memorias = {
+        'Lista': memoria_lista,
+        'Matriz (uint8)': tamanho_populacao * num_itens,
+        'Bits': tamanho_populacao * num_bytes,
+    }
+    motores = {
+        'Lista': (algoritmo_genetico, config),
+        'Matriz (uint8)': (algoritmo_genetico_vetorizado, config),
+        'Bits': (algoritmo_genetico_vetorizado, {**config, 'representacao': 'bits'}),
+    }
+    
+    print(f"\n=== REPRESENTAÇÕES: {num_itens} itens, população {tamanho_populacao} ===")
+    print("Representação  | População (MB) | Gerações/s")
+    print("--------------------------------------------")
+    for nome, (algoritmo, config_motor) in motores.items():
+        random.seed(semente)
+        inicio = time.perf_counter()
+        algoritmo(itens, capacidade, {**config_motor, 'silencioso': True})
+        duracao = time.perf_counter() - inicio
+        print(f"{nome:14} | {memorias[nome] / 1e6:14.2f} | {geracoes / duracao:10.2f}")
+    # as tabelas de soma são fixas por instância, não crescem com a população
+    print(f"(Bits usa ainda {2 * num_bytes * 256 * 8 / 1e6:.2f} MB em tabelas de soma por byte)")
+
+CONFIGURACOES = [
+    # Testes de crossover
+    {'metodo_crossover': 'um_ponto', 'descricao': "Crossover - Um Ponto"},
+    {'metodo_crossover': 'dois_pontos', 'descricao': "Crossover - Dois Pontos"},
+    {'metodo_crossover': 'uniforme', 'descricao': "Crossover - Uniforme"},
+    
+    # Testes de mutação
+    {'metodo_mutacao': 'binaria', 'taxa_mutacao': 0.01, 'descricao': "Mutação - Baixa (1%)"},
+    {'metodo_mutacao': 'binaria', 'taxa_mutacao': 0.1, 'descricao': "Mutação - Média (10%)"},
+    {'metodo_mutacao': 'binaria', 'taxa_mutacao': 0.3, 'descricao': "Mutação - Alta (30%)"},
     
+    # Testes de inicialização
+    {'inicializacao': 'aleatoria', 'descricao': "Inicialização - Aleatória"},
+    {'inicializacao': 'heuristica', 'descricao': "Inicialização - Heurística"},
+    
+    # Testes de critério de parada
+    {'criterio_parada': 'geracoes', 'descricao': "Parada - Gerações Fixas"},
+    {'criterio_parada': 'convergencia', 'limite_convergencia': 10, 'descricao': "Parada - Convergência (10 gerações)"},
+]
+
+# Configurações padrão
+CONFIG_PADRAO = {
+    'tamanho_populacao': 50,
+    'geracoes': 100,
+    'taxa_mutacao': 0.1,
+    'taxa_crossover': 0.8,
+    'metodo_selecao': 'roleta',
+    'metodo_crossover': 'um_ponto',
+    'metodo_mutacao': 'binaria',
+    'inicializacao': 'aleatoria',
+    'criterio_parada': 'geracoes'
+}
+
+def testar_configuracoes(itens, capacidade, algoritmo=algoritmo_genetico, opcoes=None, prefixo_historico=None):
+    """
+    `opcoes` é aplicado sobre cada configuração (por exemplo
+    {'progresso_a_cada': 10} ou {'silencioso': True}); com
+    `prefixo_historico`, o histórico de cada configuração é exportado para
+    '<prefixo>_<n>.csv'.
+    """
     resultados = []
     
-    for config in configuracoes:
+    for indice, config in enumerate(CONFIGURACOES):
         print(f"\n=== TESTANDO CONFIGURAÇÃO: {config['descricao']} ===")
         
-        # Configurações padrão
-        config_padrao = {
-            'tamanho_populacao': 50,
-            'geracoes': 100,
-            'taxa_mutacao': 0.1,
-            'taxa_crossover': 0.8,
-            'metodo_selecao': 'roleta',
-            'metodo_crossover': 'um_ponto',
-            'metodo_mutacao': 'binaria',
-            'inicializacao': 'aleatoria',
-            'criterio_parada': 'geracoes'
-        }
-        
-        # Atualiza com a configuração atual
-        config_padrao.update(config)
-        
-        solucao, historico = algoritmo_genetico(itens, capacidade, config_padrao)
+        # Atualiza as configurações padrão com a configuração atual
+        config_padrao = {**CONFIG_PADRAO, **config, **(opcoes or {})}
+        
+        solucao, historico = algoritmo(itens, capacidade, config_padrao)
+        if prefixo_historico:
+            historico.exportar(f"{prefixo_historico}_{indice}.csv")
         melhor_fitness = max(h[0] for h in historico)
         resultados.append((config['descricao'], melhor_fitness, historico[-1][1]))
     
@@ -277,8 +1237,10 @@ def testar_configuracoes(itens, capacidade):
     
     return resultados
 
-def executar_todos_arquivos():
+def executar_todos_arquivos(algoritmo=algoritmo_genetico, opcoes=None, pasta_historicos=None):
     resultados_gerais = defaultdict(list)
+    if pasta_historicos:
+        os.makedirs(pasta_historicos, exist_ok=True)
     
     for i in range(1, 11):
         arquivo = f'instancias/knapsack_{i}.csv'
@@ -287,7 +1249,8 @@ def executar_todos_arquivos():
         try:
             itens, capacidade = carregar_instancia(arquivo)
             if itens:
-                resultados = testar_configuracoes(itens, capacidade)
+                prefixo = os.path.join(pasta_historicos, f'knapsack_{i}') if pasta_historicos else None
+                resultados = testar_configuracoes(itens, capacidade, algoritmo, opcoes, prefixo)
                 
                 # Armazenar resultados para análise geral
                 for descricao, melhor, media in resultados:
@@ -305,4 +1268,247 @@ def executar_todos_arquivos():
         media = sum(valores) / len(valores)
         print(f"{descricao:30} | {media:18.2f}")
 
-executar_todos_arquivos()
\ No newline at end of file
+def comparar_com_otimo(arquivos=None, config=None, motor='lista'):
+    """
+    Para cada instância: ótimo exato, limite da relaxação linear e uma
+    execução do AG que para ao alcançar o ótimo (criterio_parada 'alvo'),
+    com o gap de otimalidade e o tempo até o alvo
+    """
+    if arquivos is None:
+        arquivos = [f'instancias/knapsack_{i}.csv' for i in range(1, 11)]
+    config = {**CONFIG_PADRAO, **(config or {})}
+    
+    linhas = []
+    for arquivo in arquivos:
+        if not os.path.exists(arquivo):
+            continue
+        itens, capacidade = instancia_em_cache(arquivo)
+        if not itens:
+            continue
+        
+        inicio = time.perf_counter()
+        otimo, _, metodo, provado = resolver_exato(itens, capacidade)
+        tempo_exato = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        _, historico = MOTORES[motor](itens, capacidade, {**config, 'criterio_parada': 'alvo',
+                                                          'valor_alvo': otimo, 'silencioso': True})
+        tempo_ag = time.perf_counter() - inicio
+        melhor = historico[-1][0]
+        linhas.append({
+            'arquivo': arquivo,
+            'otimo': otimo,
+            'metodo': metodo,
+            'provado_otimo': provado,
+            'limite_lp': limite_superior_fracionario(itens, capacidade),
+            'melhor_ag': melhor,
+            'gap': (otimo - melhor) / otimo if otimo else 0.0,
+            'tempo_exato': tempo_exato,
+            'tempo_ate_alvo': tempo_ag if melhor >= otimo else None,
+            'geracoes': len(historico),
+        })
+    
+    print("\n=== AG x ÓTIMO ===")
+    print("Instância                    |   Ótimo | Limite LP |  AG    |  Gap   | Exato (s) | Até alvo (s) | Gerações")
+    print("--------------------------------------------------------------------------------------------------------")
+    for linha in linhas:
+        ate_alvo = f"{linha['tempo_ate_alvo']:12.3f}" if linha['tempo_ate_alvo'] is not None else f"{'não atingiu':>12}"
+        otimo = f"{linha['otimo']}{'' if linha['provado_otimo'] else '*'}"
+        print(f"{linha['arquivo']:28} | {otimo:>7} | {linha['limite_lp']:9.1f} | {linha['melhor_ag']:6} | "
+              f"{linha['gap']:6.2%} | {linha['tempo_exato']:9.3f} | {ate_alvo} | {linha['geracoes']:8}")
+    if not all(linha['provado_otimo'] for linha in linhas):
+        print("* branch and bound interrompido: melhor valor encontrado, sem prova de otimalidade")
+    
+    return pd.DataFrame(linhas)
+
+# Varredura de Configurações
+MOTORES = {
+    'lista': algoritmo_genetico,
+    'vetorizado': algoritmo_genetico_vetorizado,
+}
+
+# Instâncias já lidas no processo que executa os trabalhos da varredura
+_instancias_carregadas = {}
+
+def instancia_em_cache(arquivo):
+    if arquivo not in _instancias_carregadas:
+        with contextlib.redirect_stdout(io.StringIO()):
+            _instancias_carregadas[arquivo] = carregar_instancia(arquivo)
+    return _instancias_carregadas[arquivo]
+
+def executar_trabalho_varredura(arquivo, indice_config, semente, motor):
+    """
+    Uma execução da varredura: instância x configuração x semente. A semente
+    reinicia o módulo random (e, por ele, o Generator do motor vetorizado),
+    então cada trabalho é reprodutível isoladamente e todas as configurações
+    de uma mesma semente partem dos mesmos números aleatórios.
+    """
+    itens, capacidade = instancia_em_cache(arquivo)
+    config = {**CONFIG_PADRAO, **CONFIGURACOES[indice_config], 'silencioso': True}
+    random.seed(semente)
+    inicio = time.perf_counter()
+    _, historico = MOTORES[motor](itens, capacidade, config)
+    duracao = time.perf_counter() - inicio
+    return {
+        'arquivo': arquivo,
+        'configuracao': indice_config,
+        'descricao': config['descricao'],
+        'semente': semente,
+        'motor': motor,
+        'melhor': max(h[0] for h in historico),
+        'media_final': historico[-1][1],
+        'geracoes': len(historico),
+        'tempo': duracao,
+    }
+
+def ler_resultados_varredura(arquivo_resultados):
+    """
+    Resultados já gravados (uma linha JSON por execução). Uma última linha
+    incompleta, de uma varredura interrompida, é ignorada (e descartada por
+    descartar_linha_incompleta antes de a varredura continuar).
+    """
+    resultados = []
+    if os.path.exists(arquivo_resultados):
+        with open(arquivo_resultados, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                try:
+                    resultados.append(json.loads(linha))
+                except json.JSONDecodeError:
+                    pass
+    return resultados
+
+def descartar_linha_incompleta(arquivo_resultados):
+    """
+    Corta o arquivo na última quebra de linha: sem isso o primeiro
+    resultado acrescentado depois de uma interrupção no meio de uma escrita
+    seria colado ao fragmento e perdido na leitura
+    """
+    if not os.path.exists(arquivo_resultados):
+        return
+    with open(arquivo_resultados, 'rb+') as arquivo:
+        dados = arquivo.read()
+        if dados and not dados.endswith(b'\n'):
+            arquivo.truncate(dados.rfind(b'\n') + 1)
+
+def executar_varredura(arquivos=None, sementes=range(5), processos=None, motor='lista',
+                       arquivo_resultados='varredura.jsonl'):
+    """
+    Roda todas as combinações (instância, configuração, semente) de
+    CONFIGURACOES num pool de processos, cada processo lendo cada instância
+    uma única vez. Cada resultado é acrescentado a `arquivo_resultados` assim
+    que termina; ao rodar de novo, as combinações já gravadas são puladas,
+    então uma varredura interrompida continua de onde parou. Uma execução
+    que falha é gravada com a chave 'erro', fica fora do resumo e é tentada
+    de novo na próxima vez.
+    Retorna um DataFrame com média, desvio padrão (entre sementes) e melhor
+    valor por instância e configuração, e imprime também uma visão geral por
+    configuração com a média relativa ao melhor valor de cada instância
+    (as instâncias têm escalas de valor diferentes).
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    if arquivos is None:
+        arquivos = [f'instancias/knapsack_{i}.csv' for i in range(1, 11)]
+    arquivos = [arquivo for arquivo in arquivos if os.path.exists(arquivo)]
+    
+    feitos = {(r['arquivo'], r['configuracao'], r['semente'], r['motor'])
+              for r in ler_resultados_varredura(arquivo_resultados) if 'erro' not in r}
+    trabalhos = [(arquivo, indice, semente, motor)
+                 for arquivo in arquivos
+                 for indice in range(len(CONFIGURACOES))
+                 for semente in sementes
+                 if (arquivo, indice, semente, motor) not in feitos]
+    
+    print(f"\n=== VARREDURA: {len(arquivos)} instâncias x {len(CONFIGURACOES)} configurações x "
+          f"{len(sementes)} sementes ({len(trabalhos)} execuções pendentes) ===")
+    
+    if trabalhos:
+        descartar_linha_incompleta(arquivo_resultados)
+        falhas = 0
+        with open(arquivo_resultados, 'a', encoding='utf-8') as saida, \
+                ProcessPoolExecutor(max_workers=processos) as executor:
+            tarefas = {executor.submit(executar_trabalho_varredura, *trabalho): trabalho for trabalho in trabalhos}
+            for concluidas, tarefa in enumerate(as_completed(tarefas), 1):
+                try:
+                    resultado = tarefa.result()
+                except Exception as e:
+                    arquivo, indice, semente, _ = tarefas[tarefa]
+                    resultado = {'arquivo': arquivo, 'configuracao': indice, 'semente': semente, 'motor': motor,
+                                 'erro': f"{type(e).__name__}: {str(e)}"}
+                    falhas += 1
+                saida.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+                saida.flush()
+                print(f"\r{concluidas}/{len(trabalhos)} execuções concluídas", end='')
+        print()
+        if falhas:
+            print(f"⚠️ {falhas} execuções falharam (ver a chave 'erro' em {arquivo_resultados})")
+    
+    chaves = {(arquivo, indice, semente, motor) for arquivo in arquivos
+              for indice in range(len(CONFIGURACOES)) for semente in sementes}
+    resultados = pd.DataFrame([r for r in ler_resultados_varredura(arquivo_resultados)
+                               if 'erro' not in r
+                               and (r['arquivo'], r['configuracao'], r['semente'], r['motor']) in chaves])
+    if resultados.empty:
+        print("Nenhuma instância encontrada para a varredura.")
+        return resultados
+    
+    # a dispersão é entre sementes de uma mesma instância
+    resumo = (resultados.groupby(['arquivo', 'configuracao', 'descricao'])['melhor']
+              .agg(media='mean', desvio='std', melhor='max', execucoes='count')
+              .reset_index())
+    
+    print("\n=== RESUMO DA VARREDURA ===")
+    for arquivo, linhas in resumo.groupby('arquivo', sort=False):
+        print(f"\n{arquivo}")
+        print("Configuração                   |   Média Melhor |  Desvio Padrão | Melhor | Execuções")
+        print("-------------------------------------------------------------------------------------")
+        for _, linha in linhas.iterrows():
+            print(f"{linha['descricao']:30} | {linha['media']:14.2f} | {linha['desvio']:14.2f} | "
+                  f"{linha['melhor']:6} | {linha['execucoes']:9}")
+    
+    # visão geral: média por instância normalizada pelo melhor valor visto na instância
+    resumo['relativo'] = resumo['media'] / resumo.groupby('arquivo')['melhor'].transform('max')
+    geral = resumo.groupby(['configuracao', 'descricao'])['relativo'].mean().reset_index('descricao')
+    print("\n=== VISÃO GERAL (média relativa ao melhor de cada instância) ===")
+    print("Configuração                   | Média Relativa")
+    print("-----------------------------------------------")
+    for _, linha in geral.iterrows():
+        print(f"{linha['descricao']:30} | {linha['relativo']:14.2%}")
+    
+    return resumo
+
+if __name__ == '__main__':
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Algoritmo genético para a mochila")
+    parser.add_argument('--varredura', action='store_true',
+                        help="roda todas as configurações com várias sementes num pool de processos")
+    parser.add_argument('--sementes', type=int, default=5, help="número de sementes da varredura")
+    parser.add_argument('--processos', type=int, default=None)
+    parser.add_argument('--motor', choices=list(MOTORES), default='lista')
+    parser.add_argument('--resultados', default='varredura.jsonl',
+                        help="arquivo JSONL da varredura (permite retomar uma varredura interrompida)")
+    parser.add_argument('--otimo', action='store_true',
+                        help="compara o AG com o ótimo exato de cada instância (gap e tempo até o alvo)")
+    parser.add_argument('--progresso-a-cada', type=int, default=1, metavar='N',
+                        help="mostra o progresso a cada N gerações")
+    parser.add_argument('--progresso-a-cada-segundos', type=float, metavar='T',
+                        help="mostra o progresso no máximo a cada T segundos")
+    parser.add_argument('--silencioso', action='store_true',
+                        help="não mostra a evolução de cada execução, só os resultados comparativos")
+    parser.add_argument('--historicos', metavar='PASTA',
+                        help="exporta o histórico de cada execução em CSV nesta pasta")
+    args = parser.parse_args()
+    if args.progresso_a_cada < 1:
+        parser.error("--progresso-a-cada deve ser >= 1")
+    
+    if args.otimo:
+        comparar_com_otimo(motor=args.motor)
+    elif args.varredura:
+        executar_varredura(sementes=range(args.sementes), processos=args.processos, motor=args.motor,
+                           arquivo_resultados=args.resultados)
+    else:
+        opcoes = {'progresso_a_cada': args.progresso_a_cada,
+                  'progresso_a_cada_segundos': args.progresso_a_cada_segundos,
+                  'silencioso': args.silencioso}
+        executar_todos_arquivos(MOTORES[args.motor], opcoes, args.historicos)